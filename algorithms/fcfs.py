@@ -1,56 +1,13 @@
-from process import State
+from algorithms.kernel import Policy, Scheduler
 
 
-class FCFS(object):
+class FCFS(Scheduler):
     """
     an algorithm which sort processes by the first arrival time. It's a non-preemptive algorithm
     """
-    def __init__(self, processes: list):
+    def __init__(self, processes, cpus: int = 1):
         """
-        :param processes: list of processes sort by arrival time
+        :param processes: list of processes or a ProcessTable. the list is not changed
+        :param cpus: number of cpus
         """
-        self.processes = processes
-        self.processes.sort(key=lambda process: process.arrival_time)
-        self.timeline = 0.0
-        self.cpu_idle_time = 0.0
-        self.executed_processes = []
-        self.suspended_processes = []
-
-    def run(self) -> dict:
-        """
-        For running the algorithm
-        :return {
-            "executed_processes": list of executed processes,
-            "total_time": total time of execution,
-            "cpu_idle_time": time that cpu was idle,
-        }
-        """
-
-        for process in self.processes:
-
-            # cpu waiting time
-            if process.arrival_time > self.timeline:
-                self.cpu_idle_time += process.arrival_time - self.timeline
-                # update time
-                self.timeline = process.arrival_time
-
-            # Run the process
-            process.start_time = self.timeline
-
-            # waiting, turnaround, response time
-            process.waiting_time = self.timeline - process.arrival_time
-            process.response_time = self.timeline - process.arrival_time
-            process.turnaround_time = process.response_time + process.burst_time
-
-            self.timeline += process.burst_time
-            process.remaining_time -= process.burst_time
-            process.end_time = self.timeline
-
-            process.state = State.EXECUTED
-            self.executed_processes.append(process)
-
-        return {
-            "executed_processes": self.executed_processes,
-            "cpu_total_time": self.timeline,
-            "cpu_idle_time": self.cpu_idle_time,
-        }
+        super(FCFS, self).__init__(processes, Policy(), cpus)
@@ -0,0 +1,661 @@
+"""
+discrete event scheduling kernel.
+every algorithm is a selection policy: a rank that orders the ready queue and a preemption rule. the kernel does
+the arrival handling, dispatching and completion bookkeeping for all of them, so a new algorithm is just a new Policy.
+processes come from a ProcessTable (simulate) or online from an iterator (simulate_stream), both run the same event
+loops
+"""
+import heapq
+import itertools
+from collections import deque
+
+import numpy as np
+
+from algorithms import vectorized
+from algorithms.trace import Trace
+from process import ProcessTable, State
+
+# rank of processes which changes while they are running (shortest remaining time first)
+REMAINING_TIME = 'remaining_time'
+# version of scheduling results of the kernel. increase it when a change gives other results, so cached results of
+# the previous version are not used
+ENGINE_VERSION = 1
+# number of times that progress of a simulation is reported
+PROGRESS_STEPS = 100
+
+
+class Policy(object):
+    """
+    selection policy of the kernel
+    """
+
+    def __init__(self, rank=None, preemptive: bool = False, quantum_number: float = None):
+        """
+        :param rank: what ready processes are sorted by, lower rank runs sooner. a column name of ProcessTable
+            ('burst_time', 'priority', 'remaining_time') or a function that gets a ProcessTable and returns an array.
+            None means first come first served
+        :param preemptive: a new process preempts the running process if its rank is lower
+        :param quantum_number: running process is preempted after this time and goes to the ready queue again
+        """
+        if preemptive and rank is None:
+            raise Exception("preemptive policy needs a rank")
+        if preemptive and quantum_number is not None:
+            raise Exception("preemptive policy with quantum number is not supported")
+        if quantum_number is not None and not quantum_number > 0:
+            raise Exception("quantum number should be greater than zero")
+
+        self.rank = rank
+        self.preemptive = preemptive
+        self.quantum_number = quantum_number
+
+    def get_ranks(self, table: ProcessTable):
+        """
+        :param table: processes
+        :return: array of rank of processes or None for first come first served
+        """
+        if self.rank is None or self.rank == REMAINING_TIME:
+            return None
+        if callable(self.rank):
+            return np.asarray(self.rank(table))
+        return getattr(table, self.rank)
+
+
+def simulate(table: ProcessTable, policy: Policy, cpus: int = 1, progress=None, trace: Trace = None) -> dict:
+    """
+    simulate processes of the table with the policy. the table is not changed
+    :param table: processes
+    :param policy: selection policy
+    :param cpus: number of cpus. more than one cpu share a global ready queue and follow the same rules as one cpu
+    :param progress: function which gets number of completed processes and number of all processes while the
+        simulation runs, e.g. for a progress bar. the simulation is cancelled with an exception if it returns False
+    :param trace: run segments of processes are added to it. no trace by default
+    :return: {
+        "order": indices of processes in execution order,
+        "start_time", "end_time", "waiting_time", "turnaround_time", "response_time": arrays in table order,
+        "cpu_total_time": total time of execution,
+        "cpu_idle_time": time that cpus were idle (sum of all cpus),
+        "cpu_busy_time": list of busy time of each cpu,
+        "migrations": number of times that a process continued on another cpu,
+    }
+    """
+    if not (isinstance(cpus, (int, np.integer)) and cpus >= 1):
+        raise Exception("number of cpus should be a positive integer")
+    _report(progress, 0, len(table))
+    # first come first served without preemption has a closed form on one cpu
+    if cpus > 1 or policy.rank is not None or policy.quantum_number is not None:
+        return _simulate_events(table, policy, cpus, progress, trace)
+
+    result = vectorized.fcfs(table.arrival_time, table.burst_time, table.arrival_order())
+    if trace is not None:
+        # each process runs once from start to end
+        order = result['order']
+        trace.extend(np.zeros(len(order)), table.pid[order], result['start_time'][order], result['end_time'][order])
+    _report(progress, len(table), len(table))
+    result['cpu_busy_time'] = [result['cpu_total_time'] - result['cpu_idle_time']]
+    # a process always continues on the only cpu
+    result['migrations'] = 0
+    return result
+
+
+def simulate_stream(processes, policy: Policy, cpus: int = 1, totals: dict = None, trace: Trace = None):
+    """
+    simulate processes online. a process is taken from the iterable when the simulation reaches its arrival time and
+    comes out as soon as it completes, so just processes which have arrived and not completed are kept in memory
+    :param processes: iterable of Process objects sorted by arrival time, like a generator which reads a file
+    :param policy: selection policy. rank should be a column name, a rank function needs a whole table
+    :param cpus: number of cpus
+    :param totals: cpu_total_time, cpu_idle_time, cpu_busy_time and migrations are saved to it at the end
+    :param trace: run segments of processes are added to it. no trace by default
+    :return: generator of completed processes with their result
+    """
+    if not (isinstance(cpus, (int, np.integer)) and cpus >= 1):
+        raise Exception("number of cpus should be a positive integer")
+    if callable(policy.rank):
+        raise Exception("rank of a stream should be a column name")
+    if totals is None:
+        totals = {}
+
+    remaining = {}
+    if policy.rank == REMAINING_TIME:
+        ranks = remaining
+    elif policy.rank is None:
+        ranks = None
+    else:
+        ranks = {}
+    columns = _Columns(remaining, ranks, {}, {}, {}, forget=True)
+    own_ranks = ranks is not None and ranks is not remaining
+
+    def arrivals():
+        last_arrival_time = None
+        for process in processes:
+            if last_arrival_time is not None and process.arrival_time < last_arrival_time:
+                raise Exception("processes of a stream should be sorted by arrival time")
+            last_arrival_time = process.arrival_time
+            # the process itself is its key
+            remaining[process] = process.burst_time
+            if own_ranks:
+                ranks[process] = getattr(process, policy.rank)
+            columns.starts[process] = None
+            columns.ends[process] = 0
+            columns.last_cpu[process] = -1
+            yield process.arrival_time, process
+
+    record = None
+    if trace is not None:
+        def record(cpu, process, start, end):
+            trace.append(cpu, process.pid, start, end)
+
+    if cpus == 1:
+        completions = _run_single(arrivals(), columns, policy, totals, record)
+    else:
+        completions = _run_smp(arrivals(), columns, policy, cpus, totals, record)
+    for process in completions:
+        process.start_time = columns.starts[process]
+        process.end_time = columns.ends[process]
+        process.turnaround_time = process.end_time - process.arrival_time
+        process.waiting_time = process.turnaround_time - process.burst_time
+        process.response_time = process.start_time - process.arrival_time
+        process.remaining_time = 0
+        process.state = State.EXECUTED
+        yield process
+
+
+class _Columns(object):
+    """
+    state of processes in the event loops, indexed by key of process. lists for a table (keys are positions of
+    processes in arrival order), dicts for a stream of processes which forget processes when they complete
+    """
+    __slots__ = ('remaining', 'ranks', 'starts', 'ends', 'last_cpu', 'forget')
+
+    def __init__(self, remaining, ranks, starts, ends, last_cpu, forget: bool):
+        """
+        :param remaining: remaining times
+        :param ranks: ranks. None for first come first served, remaining itself for shortest remaining time first
+        :param starts: start times. None for processes which haven't started yet
+        :param ends: end times
+        :param last_cpu: last cpu of processes. -1 for processes which haven't run yet
+        :param forget: delete processes from columns when they complete
+        """
+        self.remaining = remaining
+        self.ranks = ranks
+        self.starts = starts
+        self.ends = ends
+        self.last_cpu = last_cpu
+        self.forget = forget
+
+
+def _table_columns(table: ProcessTable, policy: Policy):
+    """
+    columns of the event loops as python lists sorted by arrival time
+    :return: order of processes by arrival time, iterator of (arrival time, key) of processes, columns
+    """
+    order = table.arrival_order()
+    # a sorted table (ProcessTable.sorted_by_arrival) doesn't need to be gathered
+    gather = (lambda column: column) if order is None else (lambda column: column[order])
+    if order is None:
+        order = np.arange(len(table.arrival_time))
+    size = len(order)
+    # python lists are much faster than numpy arrays for item access in a loop
+    arrivals = gather(table.arrival_time).tolist()
+    remaining = gather(table.burst_time).tolist()
+    if policy.rank == REMAINING_TIME:
+        # same list, so rank of a process changes with its remaining time
+        ranks = remaining
+    elif policy.rank is None:
+        ranks = None
+    else:
+        ranks = gather(policy.get_ranks(table)).tolist()
+    columns = _Columns(remaining, ranks, [None] * size, [0] * size, [-1] * size, forget=False)
+    return order, zip(arrivals, range(size)), columns
+
+
+def _report(progress, completed: int, size: int):
+    if progress is not None and progress(completed, size) is False:
+        raise Exception("simulation is cancelled")
+
+
+def _simulate_events(table: ProcessTable, policy: Policy, cpus: int, progress=None, trace: Trace = None) -> dict:
+    """
+    run an event loop on processes of the table and build result columns of the completions
+    """
+    order, arrivals, columns = _table_columns(table, policy)
+    totals = {}
+    # segments are recorded with keys of processes to a trace of this run, they are added to the trace with pids at
+    # the end, so segments which the trace already has are not changed
+    segments = Trace() if trace is not None else None
+    record = segments.append if trace is not None else None
+    if cpus == 1:
+        completions = _run_single(arrivals, columns, policy, totals, record)
+    else:
+        completions = _run_smp(arrivals, columns, policy, cpus, totals, record)
+    if progress is None:
+        executed = list(completions)
+    else:
+        # completions are taken in steps, so the loop isn't slowed down by checking progress for each process
+        executed = []
+        step = max(1, len(order) // PROGRESS_STEPS)
+        while True:
+            completed = list(itertools.islice(completions, step))
+            if not completed:
+                break
+            executed.extend(completed)
+            _report(progress, len(executed), len(order))
+    if trace is not None:
+        keys = segments.columns()
+        trace.extend(keys['cpu'], table.pid[order][keys['pid']], keys['start'], keys['end'])
+
+    rows = order[np.asarray(executed, dtype=np.intp)]
+    start_time = np.empty(len(order))
+    start_time[order] = columns.starts
+    end_time = np.empty(len(order))
+    end_time[order] = columns.ends
+    result = vectorized.make_result(
+        table.arrival_time, table.burst_time, rows, start_time, end_time, cpu_total_time=totals['cpu_total_time'],
+        preemptive=True
+    )
+    result.update(totals)
+    return result
+
+
+def _run_single(arrivals, columns: _Columns, policy: Policy, totals: dict, record=None):
+    """
+    event loop of one cpu. processes are taken from arrivals when they arrive
+    :param arrivals: iterator of (arrival time, key) sorted by arrival time
+    :param columns: state of processes. columns of a process are set before it comes out of arrivals
+    :param policy: selection policy
+    :param totals: cpu_total_time, cpu_idle_time, cpu_busy_time and migrations are saved to it at the end
+    :param record: function which gets cpu, key, start and end of each run segment of processes. None for no trace
+    :return: generator of keys of processes in the order they complete. start and end time of a process are in
+        columns when its key comes out
+    """
+    preemptive = policy.preemptive
+    quantum_number = policy.quantum_number
+    remaining = columns.remaining
+    ranks = columns.ranks
+    starts = columns.starts
+    ends = columns.ends
+    forget = columns.forget
+    own_ranks = ranks is not None and ranks is not remaining
+
+    # ready queue is a deque for first come first served, otherwise a heap of (rank, push number, key).
+    # push number breaks ties by the order processes came to the ready queue (arrival order, then input order)
+    fifo = ranks is None
+    ready_queue = deque() if fifo else []
+    counter = itertools.count()
+
+    def push(key):
+        if fifo:
+            ready_queue.append(key)
+        else:
+            heapq.heappush(ready_queue, (ranks[key], next(counter), key))
+
+    def pop():
+        if fifo:
+            return ready_queue.popleft()
+        return heapq.heappop(ready_queue)[2]
+
+    arrivals = iter(arrivals)
+    # next process which has not arrived yet
+    arrival = next(arrivals, None)
+    running = None
+    # time that the running process started its current run
+    slice_start = 0.0
+    timeline = 0.0
+    cpu_idle_time = 0.0
+    while True:
+
+        # a running process have done its work
+        if running is not None and remaining[running] == 0:
+            key = running
+            running = None
+            ends[key] = timeline
+            if record is not None:
+                record(0, key, slice_start, timeline)
+            yield key
+            if forget:
+                del remaining[key], starts[key], ends[key], columns.last_cpu[key]
+                if own_ranks:
+                    del ranks[key]
+
+        # All processes have done
+        if running is None and arrival is None and not ready_queue:
+            break
+
+        # processes that have arrived until this timeline
+        if arrival is not None and arrival[0] <= timeline:
+            if preemptive:
+                arrived = []
+                while arrival is not None and arrival[0] <= timeline:
+                    arrived.append(arrival[1])
+                    arrival = next(arrivals, None)
+                arrived.sort(key=ranks.__getitem__)
+                # best new process runs if cpu is free or it has lower rank than the running process
+                if running is None or ranks[running] > ranks[arrived[0]]:
+                    if running is not None:
+                        if record is not None:
+                            record(0, running, slice_start, timeline)
+                        push(running)
+                    running = arrived[0]
+                    starts[running] = timeline
+                    slice_start = timeline
+                    arrived = arrived[1:]
+                for key in arrived:
+                    push(key)
+            else:
+                while arrival is not None and arrival[0] <= timeline:
+                    push(arrival[1])
+                    arrival = next(arrivals, None)
+
+        # If no process is running, then pick the process from ready queue, maybe a process has ran before
+        if running is None and ready_queue:
+            running = pop()
+            slice_start = timeline
+            if starts[running] is None:
+                starts[running] = timeline
+
+        # run process until some important things happen
+        if running is None:
+            # cpu is idle until the next arrival, so jump to it
+            cpu_idle_time += arrival[0] - timeline
+            timeline = arrival[0]
+        elif quantum_number is not None and remaining[running] > quantum_number:
+            remaining[running] -= quantum_number
+            timeline += quantum_number
+            # processes which arrive until the quantum expiry (expiry time itself too) go to the ready queue
+            # before the preempted process
+            while arrival is not None and arrival[0] <= timeline:
+                push(arrival[1])
+                arrival = next(arrivals, None)
+            if record is not None:
+                record(0, running, slice_start, timeline)
+            push(running)
+            running = None
+        elif preemptive and arrival is not None and arrival[0] < timeline + remaining[running]:
+            # next arrival may preempt the running process
+            remaining[running] -= arrival[0] - timeline
+            timeline = arrival[0]
+        else:
+            timeline += remaining[running]
+            remaining[running] = 0
+
+    totals['cpu_total_time'] = timeline
+    totals['cpu_idle_time'] = cpu_idle_time
+    totals['cpu_busy_time'] = [timeline - cpu_idle_time]
+    # a process always continues on the only cpu
+    totals['migrations'] = 0
+
+
+def _run_smp(arrivals, columns: _Columns, policy: Policy, cpus: int, totals: dict, record=None):
+    """
+    event loop of several cpus with a global ready queue.
+    events of cpus (completion and quantum expiry) are in a heap, idle cpus are in a heap (lower id first) and for
+    preemption running processes are in a heap with the highest rank on top, so each event costs O(log cpus).
+    at a time, events of cpus are handled first, then arrivals, then idle cpus pick processes from the ready queue.
+    scheduling is the same as _run_single on one cpu: with preemption, processes which arrive take free cpus before
+    processes of the ready queue, and a process is preempted just by an arriving process with lower rank.
+    a process which continues on another cpu after preemption is a migration. a process prefers its last cpu if it's
+    idle
+    :param arrivals: same as _run_single function
+    :param columns: same as _run_single function
+    :param policy: selection policy
+    :param cpus: number of cpus
+    :param totals: same as _run_single function
+    :param record: same as _run_single function
+    :return: same as _run_single function
+    """
+    preemptive = policy.preemptive
+    quantum_number = policy.quantum_number
+    rank_by_remaining = policy.rank == REMAINING_TIME
+    remaining = columns.remaining
+    ranks = columns.ranks
+    starts = columns.starts
+    ends = columns.ends
+    last_cpu = columns.last_cpu
+    forget = columns.forget
+    own_ranks = ranks is not None and ranks is not remaining
+
+    fifo = ranks is None
+    ready_queue = deque() if fifo else []
+    counter = itertools.count()
+
+    def push(key):
+        if fifo:
+            ready_queue.append(key)
+        else:
+            heapq.heappush(ready_queue, (ranks[key], next(counter), key))
+
+    def pop():
+        if fifo:
+            return ready_queue.popleft()
+        return heapq.heappop(ready_queue)[2]
+
+    arrivals = iter(arrivals)
+    arrival = next(arrivals, None)
+    running = [None] * cpus
+    slice_start = [0.0] * cpus
+    # the slice ends with completion of the process, otherwise with quantum expiry
+    completes = [False] * cpus
+    # version of a cpu changes when its process changes, so old events of the cpu are ignored
+    version = [0] * cpus
+    busy = [0.0] * cpus
+    is_idle = [True] * cpus
+    idle_cpus = list(range(cpus))
+    # a cpu which is taken by its last process stays in the idle heap, so it's not pushed again
+    in_idle_cpus = [True] * cpus
+    idle_count = cpus
+    events = []
+    running_heap = []
+    migrations = 0
+    timeline = 0.0
+
+    def take_idle_cpu(key):
+        nonlocal idle_count
+        cpu = last_cpu[key]
+        if cpu == -1 or not is_idle[cpu]:
+            cpu = heapq.heappop(idle_cpus)
+            in_idle_cpus[cpu] = False
+            # idle heap may have cpus that are busy now
+            while not is_idle[cpu]:
+                cpu = heapq.heappop(idle_cpus)
+                in_idle_cpus[cpu] = False
+        is_idle[cpu] = False
+        idle_count -= 1
+        return cpu
+
+    def free_cpu(cpu):
+        nonlocal idle_count
+        running[cpu] = None
+        version[cpu] += 1
+        is_idle[cpu] = True
+        idle_count += 1
+        if not in_idle_cpus[cpu]:
+            in_idle_cpus[cpu] = True
+            heapq.heappush(idle_cpus, cpu)
+
+    def dispatch(key):
+        nonlocal migrations
+        cpu = take_idle_cpu(key)
+        if last_cpu[key] != -1 and last_cpu[key] != cpu:
+            migrations += 1
+        last_cpu[key] = cpu
+        if starts[key] is None:
+            starts[key] = timeline
+        running[cpu] = key
+        slice_start[cpu] = timeline
+        version[cpu] += 1
+        if quantum_number is not None and remaining[key] > quantum_number:
+            completes[cpu] = False
+            slice_end = timeline + quantum_number
+        else:
+            completes[cpu] = True
+            slice_end = timeline + remaining[key]
+        heapq.heappush(events, (slice_end, cpu, version[cpu]))
+        if preemptive:
+            # remaining time of running processes decreases together, so finish time orders them like remaining time
+            rank = slice_end if rank_by_remaining else ranks[key]
+            heapq.heappush(running_heap, (-rank, cpu, version[cpu]))
+            # old entries are removed from top of the heap only when the ready queue is not empty, so they are
+            # removed here too. otherwise the heap grows with the number of processes on an idle system
+            if len(running_heap) > 4 * cpus:
+                running_heap[:] = [entry for entry in running_heap if entry[2] == version[entry[1]]]
+                heapq.heapify(running_heap)
+
+    while True:
+        # events of cpus which their process has changed are ignored
+        while events and events[0][2] != version[events[0][1]]:
+            heapq.heappop(events)
+        next_event = events[0][0] if events else None
+        next_arrival = arrival[0] if arrival is not None else None
+        if next_event is None and next_arrival is None:
+            break
+        if next_event is None or (next_arrival is not None and next_arrival < next_event):
+            timeline = next_arrival
+        else:
+            timeline = next_event
+
+        # events of cpus at this time
+        while events and events[0][0] == timeline:
+            _, cpu, cpu_version = heapq.heappop(events)
+            if cpu_version != version[cpu]:
+                continue
+            key = running[cpu]
+            busy[cpu] += timeline - slice_start[cpu]
+            if record is not None:
+                record(cpu, key, slice_start[cpu], timeline)
+            if completes[cpu]:
+                remaining[key] = 0
+                ends[key] = timeline
+                yield key
+                if forget:
+                    del remaining[key], starts[key], ends[key], last_cpu[key]
+                    if own_ranks:
+                        del ranks[key]
+            else:
+                remaining[key] -= quantum_number
+                # processes which arrive until the quantum expiry go to the ready queue before the preempted process
+                while arrival is not None and arrival[0] <= timeline:
+                    push(arrival[1])
+                    arrival = next(arrivals, None)
+                push(key)
+            free_cpu(cpu)
+
+        # processes that have arrived until this timeline
+        if preemptive and arrival is not None and arrival[0] <= timeline:
+            arrived = []
+            while arrival is not None and arrival[0] <= timeline:
+                arrived.append(arrival[1])
+                arrival = next(arrivals, None)
+            arrived.sort(key=ranks.__getitem__)
+            # best new processes run on free cpus, then they preempt running processes with the highest rank
+            # which is higher than theirs, like on one cpu. others go to the ready queue
+            for i, key in enumerate(arrived):
+                if not idle_count:
+                    while running_heap and running_heap[0][2] != version[running_heap[0][1]]:
+                        heapq.heappop(running_heap)
+                    rank, cpu, _ = running_heap[0]
+                    running_rank = -rank - timeline if rank_by_remaining else -rank
+                    if not running_rank > ranks[key]:
+                        # next processes have the same rank or higher
+                        for key in arrived[i:]:
+                            push(key)
+                        break
+                    heapq.heappop(running_heap)
+                    preempted = running[cpu]
+                    busy[cpu] += timeline - slice_start[cpu]
+                    if record is not None:
+                        record(cpu, preempted, slice_start[cpu], timeline)
+                    remaining[preempted] -= timeline - slice_start[cpu]
+                    push(preempted)
+                    free_cpu(cpu)
+                dispatch(key)
+        else:
+            while arrival is not None and arrival[0] <= timeline:
+                push(arrival[1])
+                arrival = next(arrivals, None)
+
+        while idle_count and ready_queue:
+            dispatch(pop())
+
+    totals['cpu_total_time'] = timeline
+    totals['cpu_idle_time'] = cpus * timeline - sum(busy)
+    totals['cpu_busy_time'] = busy
+    totals['migrations'] = migrations
+
+
+class Scheduler(object):
+    """
+    base of algorithms. an algorithm is a policy which runs on the kernel
+    """
+
+    def __init__(self, processes, policy: Policy, cpus: int = 1):
+        """
+        :param processes: list of processes or a ProcessTable. the list is not changed. an iterable of processes for
+            stream method
+        :param policy: selection policy of the algorithm
+        :param cpus: number of cpus
+        """
+        self.processes = processes
+        self.policy = policy
+        self.cpus = cpus
+        # a table runs on its columns and doesn't need process objects
+        self.table = processes if isinstance(processes, ProcessTable) else None
+        self.timeline = 0.0
+        self.cpu_idle_time = 0.0
+        self.cpu_busy_time = []
+        self.migrations = 0
+        self.executed_processes = []
+
+    def run(self, progress=None, trace: Trace = None) -> dict:
+        """
+        For running the algorithm
+        :param progress: function which gets number of completed processes and number of all processes while the
+            algorithm runs. the algorithm is cancelled with an exception if it returns False
+        :param trace: run segments of processes are added to it. no trace by default
+        :return {
+            "executed_processes": list of executed processes (row indices for a ProcessTable),
+            "cpu_total_time": total time of execution,
+            "cpu_idle_time": time that cpus were idle,
+            "cpu_busy_time": list of busy time of each cpu,
+            "migrations": number of times that a process continued on another cpu,
+        }
+        """
+        table = self.table if self.table is not None else ProcessTable.from_processes(self.processes)
+        result = table.apply_result(simulate(table, self.policy, self.cpus, progress, trace))
+
+        if self.table is None:
+            # save result to process objects
+            start_time = table.start_time.tolist()
+            end_time = table.end_time.tolist()
+            executed_processes = []
+            for index in result['executed_processes'].tolist():
+                process = self.processes[index]
+                process.start_time = start_time[index]
+                process.end_time = end_time[index]
+                process.turnaround_time = process.end_time - process.arrival_time
+                process.waiting_time = process.turnaround_time - process.burst_time
+                process.response_time = process.start_time - process.arrival_time
+                process.remaining_time = 0
+                process.state = State.EXECUTED
+                executed_processes.append(process)
+            result['executed_processes'] = executed_processes
+
+        self.executed_processes = result['executed_processes']
+        self.timeline = result['cpu_total_time']
+        self.cpu_idle_time = result['cpu_idle_time']
+        self.cpu_busy_time = result['cpu_busy_time']
+        self.migrations = result['migrations']
+        return result
+
+    def stream(self, trace: Trace = None):
+        """
+        run the algorithm online. processes of the algorithm should be an iterable of processes sorted by arrival
+        time, they are read while the algorithm runs and completed processes are not kept
+        timeline, cpu_idle_time, cpu_busy_time and migrations attrs are set when the stream is finished
+        :return: generator of completed processes in the order they complete
+        """
+        totals = {}
+        yield from simulate_stream(self.processes, self.policy, self.cpus, totals, trace)
+        self.timeline = totals['cpu_total_time']
+        self.cpu_idle_time = totals['cpu_idle_time']
+        self.cpu_busy_time = totals['cpu_busy_time']
+        self.migrations = totals['migrations']
@@ -0,0 +1,99 @@
+"""
+execution trace of a simulation. each run of a process on a cpu is a segment (cpu, pid, start, end), so preemptions,
+context switches and a gantt chart of the simulation can be found from it.
+segments are kept in typed arrays (array module) which grow by amortized doubling, so a trace of millions of
+segments is a few flat buffers instead of millions of objects
+"""
+from array import array
+
+import numpy as np
+
+import storage  # local module
+
+
+class Trace(object):
+    """
+    run segments of processes on cpus. a process which continues on the same cpu right after its segment (like RR
+    when nothing else is ready) extends its last segment, so segments are run lengths
+    """
+    # column name, type code of array module and numpy type of it
+    COLUMNS = (('cpu', 'i', np.int32), ('pid', 'q', np.int64), ('start', 'd', np.float64), ('end', 'd', np.float64))
+
+    def __init__(self):
+        self._cpu = array('i')
+        self._pid = array('q')
+        self._start = array('d')
+        self._end = array('d')
+        # index of last segment of each cpu
+        self._last = {}
+
+    def append(self, cpu: int, pid: int, start: float, end: float):
+        """
+        add a segment. segments of a cpu should be added in time order
+        """
+        if end <= start:
+            return
+        index = self._last.get(cpu)
+        if index is not None and self._pid[index] == pid and self._end[index] == start:
+            self._end[index] = end
+            return
+        self._last[cpu] = len(self._cpu)
+        self._cpu.append(cpu)
+        self._pid.append(pid)
+        self._start.append(start)
+        self._end.append(end)
+
+    def extend(self, cpu, pid, start, end):
+        """
+        add segments as columns, e.g. segments of a vectorized algorithm
+        """
+        cpu, pid, start, end = (np.asarray(column) for column in (cpu, pid, start, end))
+        used = end > start
+        for column, (name, _, dtype) in zip((cpu, pid, start, end), self.COLUMNS):
+            getattr(self, f"_{name}").frombytes(np.ascontiguousarray(column[used], dtype=dtype).tobytes())
+        # segments of columns are not extended by next segments
+        self._last = {}
+
+    def __len__(self):
+        return len(self._cpu)
+
+    def columns(self) -> dict:
+        """
+        :return: dict of column name (cpu, pid, start, end) and numpy array. arrays share memory of the trace
+        """
+        return {
+            name: np.frombuffer(getattr(self, f"_{name}"), dtype=dtype) if len(self) else np.empty(0, dtype=dtype)
+            for name, _, dtype in self.COLUMNS
+        }
+
+    def context_switches(self) -> int:
+        """
+        number of times that a cpu started another process after a segment. an idle cpu which starts a process is
+        not counted
+        """
+        columns = self.columns()
+        order = np.lexsort((columns['start'], columns['cpu']))
+        cpu, pid = columns['cpu'][order], columns['pid'][order]
+        start, end = columns['start'][order], columns['end'][order]
+        same_cpu = cpu[1:] == cpu[:-1]
+        return int(np.count_nonzero(same_cpu & (pid[1:] != pid[:-1]) & (start[1:] == end[:-1])))
+
+    def save(self, path) -> bool:
+        """
+        export the trace to a csv, parquet, arrow or .npy folder file by suffix of the path
+        :param path: path of the file
+        :return: bool
+        """
+        return storage.write_columns(path, self.columns())
+
+    @classmethod
+    def read(cls, path):
+        """
+        read an exported trace
+        :param path: path of the file
+        :return: Trace
+        """
+        columns = storage.read_columns(path, [name for name, _, _ in cls.COLUMNS])
+        trace = cls()
+        trace.extend(columns['cpu'], columns['pid'], columns['start'], columns['end'])
+        return trace
@@ -0,0 +1,75 @@
+"""
+array engine of first come first served.
+it gets columns of the workload (numpy arrays) instead of process objects and returns columns of the result,
+so big workloads can be simulated without creating a python object for each process.
+fcfs is fully vectorized and the scheduling kernel (algorithms.kernel) uses it for first come first served policy on
+one cpu, other policies run on event loops of the kernel.
+"""
+import numpy as np
+
+
+def make_result(arrival_time, burst_time, order, start_time, end_time, cpu_total_time=None, preemptive=False) -> dict:
+    """
+    build result of an array engine or the scheduling kernel
+    :param order: indices of processes in the order they have executed
+    :param start_time: start time of each process (same index as input columns)
+    :param end_time: end time of each process (same index as input columns)
+    :param cpu_total_time: timeline at the end of simulation. last end time by default
+    :param preemptive: waiting time of preempted processes is turnaround time minus burst time
+    :return: dict of result columns and cpu times
+    """
+    if cpu_total_time is None:
+        cpu_total_time = float(end_time.max()) if len(end_time) else 0.0
+    if preemptive:
+        waiting_time = end_time - arrival_time - burst_time
+    else:
+        waiting_time = start_time - arrival_time
+    return {
+        "order": order,
+        "start_time": start_time,
+        "end_time": end_time,
+        "waiting_time": waiting_time,
+        "turnaround_time": end_time - arrival_time,
+        "response_time": start_time - arrival_time,
+        "cpu_total_time": cpu_total_time,
+        "cpu_idle_time": cpu_total_time - float(burst_time.sum()),
+    }
+
+
+def fcfs(arrival_time, burst_time, order) -> dict:
+    """
+    FCFS in closed form. for processes sorted by arrival time, end time of process i is
+    cumsum(burst)[i] + max(0, max over j <= i of (arrival[j] - cumsum(burst)[j - 1]))
+    so the whole schedule is a cumulative sum and a running maximum.
+    :param arrival_time: array of arrival times
+    :param burst_time: array of burst times
+    :param order: arrival order of processes, None if they are already sorted by arrival time (like output of
+        ProcessTable.arrival_order)
+    :return: {
+        "order": indices of processes in execution order,
+        "start_time", "end_time", "waiting_time", "turnaround_time", "response_time": arrays in input order,
+        "cpu_total_time": total time of execution,
+        "cpu_idle_time": time that cpu was idle,
+    }
+    """
+    arrival_time = np.asarray(arrival_time)
+    burst_time = np.asarray(burst_time)
+    if order is None:
+        # already sorted workloads don't need to be gathered and scattered
+        order = np.arange(len(arrival_time))
+        arrivals, bursts = arrival_time, burst_time
+    else:
+        arrivals, bursts = arrival_time[order], burst_time[order]
+
+    cumulative_burst = np.cumsum(bursts)
+    # the latest arrival which the cpu had to wait for, shifted by the work done before it
+    shift = np.maximum.accumulate(arrivals - (cumulative_burst - bursts))
+    ends = cumulative_burst + np.maximum(shift, 0)
+
+    if arrivals is arrival_time:
+        end_time = ends
+    else:
+        end_time = np.empty_like(ends)
+        end_time[order] = ends
+    start_time = end_time - burst_time
+    return make_result(arrival_time, burst_time, order, start_time, end_time)
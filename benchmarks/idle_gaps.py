@@ -0,0 +1,70 @@
+"""
+regression benchmark for idle periods of the cpu.
+every algorithm runs on workloads with the same number of processes but the arrival times are spread over
+longer and longer ranges, so the cpu is idle most of the time. run time must not grow with the idle time.
+
+run it from root of the project:
+    python -m benchmarks.idle_gaps
+"""
+import random
+import sys
+import time
+
+import algorithms  # local module
+from process import Process
+
+ALGORITHMS = ["FCFS", "NonPreemptiveSFJ", "PreemptiveSFJ", "RR", "NonPreemptivePriority", "PreemptivePriority"]
+MAX_ARRIVAL_TIMES = [10 ** 3, 10 ** 6, 10 ** 9]
+# run time of the sparsest workload may be this much slower than the densest one
+MAX_SLOWDOWN = 3.0
+
+
+def generate_processes(size: int, max_arrival_time: int, seed: int = 0) -> list:
+    """
+    :param size: number of processes
+    :param max_arrival_time: maximum number for random number of arrival time
+    :param seed: seed of random generator
+    :return: list of processes
+    """
+    generator = random.Random(seed)
+    return [
+        Process(
+            pid=i + 1,
+            arrival_time=generator.randint(0, max_arrival_time),
+            priority=generator.randint(0, 10),
+            burst_time=generator.randint(0, 40)
+        )
+        for i in range(size)
+    ]
+
+
+def measure(algorithm: str, size: int, max_arrival_time: int, repeat: int = 3) -> float:
+    """
+    :return: best run time of the algorithm in second
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        processes = generate_processes(size, max_arrival_time)
+        algorithm_instance = getattr(algorithms, algorithm)(processes)
+        started_at = time.perf_counter()
+        algorithm_instance.run()
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+def main(size: int = 2000) -> bool:
+    ok = True
+    # header shows the max arrival time of each column
+    print(f"{'algorithm':<24}" + "".join(f"{m:>14}" for m in MAX_ARRIVAL_TIMES))
+    for algorithm in ALGORITHMS:
+        run_times = [measure(algorithm, size, max_arrival_time) for max_arrival_time in MAX_ARRIVAL_TIMES]
+        slowdown = run_times[-1] / run_times[0]
+        print(f"{algorithm:<24}" + "".join(f"{t:>13.4f}s" for t in run_times) + f"   x{slowdown:.2f}")
+        if slowdown > MAX_SLOWDOWN:
+            print(f"  {algorithm} depends on the length of idle periods")
+            ok = False
+    return ok
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
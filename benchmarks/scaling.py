@@ -0,0 +1,205 @@
+"""
+scaling benchmark of all algorithms.
+every algorithm runs on seeded workloads from 1k to 10M processes in a dense regime (processes arrive much faster than
+cpus finish them, so the ready queue is long) and a sparse regime (cpus are idle most of the time).
+wall time, processes per second and peak memory of each run are measured, and the scaling exponent k of
+time ~ size ** k is fitted for each algorithm and regime, so an algorithm which is quadratic somewhere is flagged.
+results are saved to a json file with the git commit, so runs of two commits can be compared.
+
+each run is in a new process, so peak memory of a run isn't hidden by earlier runs.
+run it from root of the project:
+    python -m benchmarks.scaling
+    python -m benchmarks.scaling --max-size 100000 --algorithms RR FCFS
+    python -m benchmarks.scaling --compare results/benchmarks/scaling_<commit>.json
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pathlib import Path
+
+ALGORITHMS = ["FCFS", "NonPreemptiveSFJ", "PreemptiveSFJ", "RR", "NonPreemptivePriority", "PreemptivePriority"]
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+# mean burst time of the workloads (uniform between 0 and 40)
+MAX_BURST_TIME = 40
+MEAN_BURST_TIME = MAX_BURST_TIME / 2
+# load of a cpu is arrival rate * mean burst time. more than 1 means processes wait in the ready queue
+REGIMES = {
+    'dense': 10.0,
+    'sparse': 0.1,
+}
+# sizes smaller than this are dominated by fixed costs, so they are not used for fitting
+MIN_FIT_SIZE = 10 ** 4
+# runs faster than this (seconds) are mostly noise of the timer and caches, they are not used for fitting either
+MIN_FIT_TIME = 1e-3
+# an algorithm with a higher scaling exponent is flagged
+MAX_EXPONENT = 1.3
+
+
+def _peak_memory() -> float:
+    """
+    peak resident memory of this process in MB
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, mac reports bytes
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def measure(algorithm: str, size: int, regime: str, cpus: int = 1, repeat: int = 1, seed: int = 0) -> dict:
+    """
+    run an algorithm on a seeded workload. it's called in a new process
+    :param algorithm: name of a class of algorithms module
+    :param size: number of processes
+    :param regime: name of a regime of REGIMES
+    :param cpus: number of cpus
+    :param repeat: number of runs, the fastest one is reported
+    :param seed: seed of the workload
+    :return: measurements of the run
+    """
+    import algorithms  # local module
+    from workload import WorkloadGenerator
+
+    generator = WorkloadGenerator(
+        seed, arrival='poisson', arrival_rate=cpus * REGIMES[regime] / MEAN_BURST_TIME, max_burst_time=MAX_BURST_TIME)
+    processes = generator.generate(size)
+    # the workload is sorted before runs, so sorting it is not measured
+    processes = processes.sorted_by_arrival()
+    memory_before_run = _peak_memory()
+
+    wall_time = float('inf')
+    for _ in range(repeat):
+        table = processes.copy()
+        started_at = time.perf_counter()
+        getattr(algorithms, algorithm)(table, cpus=cpus).run()
+        wall_time = min(wall_time, time.perf_counter() - started_at)
+    peak_memory = _peak_memory()
+
+    return {
+        "algorithm": algorithm,
+        "regime": regime,
+        "size": size,
+        "cpus": cpus,
+        "wall_time": wall_time,
+        "processes_per_second": size / wall_time if wall_time > 0 else float('inf'),
+        "peak_memory_mb": peak_memory,
+        # memory which the run needed more than the workload
+        "run_memory_mb": peak_memory - memory_before_run,
+    }
+
+
+def fit_exponent(sizes: list, wall_times: list) -> float:
+    """
+    k of wall time ~ size ** k by least squares of logs. sizes smaller than MIN_FIT_SIZE and runs faster than
+    MIN_FIT_TIME are not used if there are enough other ones. heaps of the kernel are n log n, so k is a bit more
+    than 1 for them
+    :return: k or None if there are less than two sizes
+    """
+    points = [(size, wall_time) for size, wall_time in zip(sizes, wall_times)
+              if size >= MIN_FIT_SIZE and wall_time >= MIN_FIT_TIME]
+    if len(points) < 2:
+        points = list(zip(sizes, wall_times))
+    if len(points) < 2:
+        return None
+    sizes, wall_times = zip(*points)
+    return float(np.polyfit(np.log(sizes), np.log(np.maximum(wall_times, 1e-9)), 1)[0])
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict):
+    """
+    print speedup of each run over the same run of a baseline result file
+    """
+    baseline_times = {
+        (run['algorithm'], run['regime'], run['size'], run['cpus']): run['wall_time'] for run in baseline['runs']}
+    print(f"\ncompared with {baseline.get('commit')} (speedup > 1 is faster now)")
+    for run in results['runs']:
+        key = (run['algorithm'], run['regime'], run['size'], run['cpus'])
+        if key in baseline_times:
+            print(f"{run['algorithm']:<24}{run['regime']:<8}{run['size']:>10}"
+                  f"   x{baseline_times[key] / run['wall_time']:.2f}")
+
+
+def parse_arguments(args=None):
+    parser = argparse.ArgumentParser(description="scaling benchmark of scheduling algorithms")
+    parser.add_argument('--algorithms', nargs='+', default=ALGORITHMS, help="algorithm names. all by default")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help="numbers of processes")
+    parser.add_argument('--max-size', type=int, default=None, help="skip sizes bigger than this")
+    parser.add_argument('--regimes', nargs='+', default=list(REGIMES), choices=list(REGIMES), help="arrival regimes")
+    parser.add_argument('--cpus', type=int, default=1, help="number of cpus")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="runs of each size up to 100000 processes, the fastest one is reported. bigger sizes run once")
+    parser.add_argument('--output', default=None,
+                        help="json file of results. results/benchmarks/scaling_<commit>.json by default")
+    parser.add_argument('--compare', default=None, help="json file of another run to compare with")
+    return parser.parse_args(args)
+
+
+def main(args=None) -> bool:
+    arguments = parse_arguments(args)
+    sizes = sorted(size for size in arguments.sizes if arguments.max_size is None or size <= arguments.max_size)
+
+    results = {
+        "commit": _git_commit(),
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "runs": [],
+        "fits": [],
+    }
+    ok = True
+    print(f"{'algorithm':<24}{'regime':<8}{'size':>10}{'wall time':>14}{'processes/s':>14}{'peak MB':>10}")
+    # a new process for each run, spawned so it doesn't inherit memory of this process
+    context = multiprocessing.get_context('spawn')
+    for algorithm in arguments.algorithms:
+        for regime in arguments.regimes:
+            wall_times = []
+            for size in sizes:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    run = executor.submit(
+                        measure, algorithm, size, regime, arguments.cpus, arguments.repeat if size <= 10 ** 5 else 1
+                    ).result()
+                results['runs'].append(run)
+                wall_times.append(run['wall_time'])
+                print(f"{algorithm:<24}{regime:<8}{size:>10}{run['wall_time']:>13.4f}s"
+                      f"{run['processes_per_second']:>14.0f}{run['peak_memory_mb']:>10.0f}")
+
+            exponent = fit_exponent(sizes, wall_times)
+            flagged = exponent is not None and exponent > MAX_EXPONENT
+            results['fits'].append({
+                "algorithm": algorithm, "regime": regime, "cpus": arguments.cpus, "exponent": exponent,
+                "flagged": flagged
+            })
+            if exponent is not None:
+                print(f"  scaling exponent {exponent:.2f}" + ("  <- worse than linear" if flagged else ""))
+            ok = ok and not flagged
+
+    output = Path(arguments.output or Path("results/benchmarks") / f"scaling_{results['commit'] or 'local'}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(results, file, indent=4)
+    print(f"results are saved to {output}")
+
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            compare(results, json.load(file))
+    return ok
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,368 @@
+"""
+charts of results of simulations without Tk. figures are created without pyplot, so they are drawn by the agg
+backend, can be rendered in worker processes and are freed as soon as they are saved
+e.g. python charts.py FCFS RR --workers 4 renders charts of results/FCFS.csv and results/RR.csv and the comparison of
+them. python charts.py --store results/store renders the newest runs of the result store
+"""
+import argparse
+import json
+
+import matplotlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+
+import storage  # local module
+from algorithms.trace import Trace
+from metrics import bin_metrics
+from result_store import ResultStore
+from pathlib import Path
+
+# columns which processes are binned by, with label of x axis and name of the chart file
+CHART_COLUMNS = {
+    'priority': ("Priority", 'priority'),
+    'burst_time': ("Burst time", 'burst'),
+    'arrival_time': ("Arrival time", 'arrival'),
+}
+METRIC_COLUMNS = ('waiting_time', 'turnaround_time', 'response_time')
+# summary of simulation which is written on charts
+SUMMARY_COLUMNS = (
+    'run_time', 'cpu_total_time', 'cpu_run_time', 'cpu_utilization', 'throughput',
+    'average_waiting_time', 'average_turnaround_time', 'average_response_time'
+)
+
+
+def _init_worker():
+    """
+    workers draw with agg even if the main process has a window backend like Tk
+    """
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+
+def summary_text(summary: dict) -> str:
+    """
+    :param summary: summary of simulation like Simulator.json_export
+    :return: text of summary for charts
+    """
+    return (
+            'Simulation time: %.10f s\n'
+            'CPU total time: %.0f s\n'
+            'CPU run time: %.0f s\n'
+            'CPU utilization: %.6f%%\n'
+            'Throughput: %.6f\n'
+            'Average waiting time: %.2f\n'
+            'Average turnaround time: %.2f\n'
+            'Average response time: %.2f' % (
+                summary.get('run_time', 0),
+                summary.get('cpu_total_time', 0),
+                summary.get('cpu_run_time', 0),
+                (summary.get('cpu_utilization', 0) * 100),
+                summary.get('throughput', 0),
+                summary.get('average_waiting_time', 0),
+                summary.get('average_turnaround_time', 0),
+                summary.get('average_response_time', 0)
+            )
+    )
+
+
+def read_result(algorithm: str, folder='results/'):
+    """
+    read saved result of an algorithm (Simulator.save_result_simulation). csv files have summary in their first row,
+    other formats have it in a json file
+    :param algorithm: algorithm name
+    :param folder: folder of results
+    :return: dict of column name and array of processes, dict of summary
+    """
+    folder = Path(folder)
+    columns = [*CHART_COLUMNS, *METRIC_COLUMNS]
+    csv_path = folder / f"{algorithm}.csv"
+    if csv_path.exists():
+        # other columns are not parsed
+        df = pd.read_csv(csv_path, usecols=lambda column: column in columns or column in SUMMARY_COLUMNS)
+        summary = {column: df[column][0] for column in SUMMARY_COLUMNS if column in df.columns}
+        return {column: df[column].to_numpy() for column in columns}, summary
+
+    for file_format in ('npy', 'arrow', 'parquet'):
+        path = folder / f"{algorithm}{storage.SUFFIXES[file_format]}"
+        if path.exists():
+            with open(folder / f"{algorithm}.json") as file:
+                summary = json.load(file)
+            return storage.read_columns(path, columns), summary
+    raise Exception("You should have run algorithm first")
+
+
+def algorithm_figures(title: str, columns: dict, summary: dict, bins: int = 20, new_figure=Figure) -> dict:
+    """
+    charts of mean waiting, turnaround and response time of processes by priority, burst time and arrival time
+    :param title: title of charts, like algorithm name
+    :param columns: dict of column name and array of processes, like output of read_result
+    :param summary: summary of simulation which is written on charts
+    :param bins: maximum number of bars of each chart
+    :param new_figure: function which creates a figure. Figure by default, pyplot.figure for windows
+    :return: dict of chart name (priority, burst, arrival) and figure
+    """
+    metrics = {metric: columns[metric] for metric in METRIC_COLUMNS}
+    text = summary_text(summary)
+    figures = {}
+    for column, (label, name) in CHART_COLUMNS.items():
+        figure = new_figure(figsize=(30, 15))
+        compressed_df = bin_metrics(columns[column], metrics, bins)
+        compressed_df.plot(kind='bar', xlabel=label, ylabel="Time", title=title, ax=figure.add_subplot())
+        figure.text(0.5, 0.25, text, bbox={'facecolor': 'white', 'alpha': 0.5, 'pad': 50})
+        figures[name] = figure
+    return figures
+
+
+def comparison_figure(algorithms_df: pd.DataFrame, new_figure=Figure):
+    """
+    bar chart of average times of algorithms
+    :param algorithms_df: dataframe of average times of each algorithm (Simulator.compare_algorithms)
+    :param new_figure: function which creates a figure. Figure by default, pyplot.figure for windows
+    :return: figure
+    """
+    figure = new_figure(figsize=(20.5, 15.5))
+    subplot = algorithms_df.plot(kind='bar', ax=figure.add_subplot())
+    subplot.set_xlabel('algorithm name')
+    subplot.set_ylabel('Time')
+    subplot.set_title("analyze algorithms")
+    subplot.legend()
+    return figure
+
+
+def _busy_fraction(start: np.ndarray, end: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    fraction of each time bin that a cpu is busy
+    :param start: start of segments of the cpu, sorted
+    :param end: end of segments of the cpu
+    :param edges: edges of time bins
+    """
+    if not len(start):
+        # a cpu without segments, e.g. an idle cpu of a window
+        return np.zeros(len(edges) - 1)
+    lengths = end - start
+    # busy time before each segment
+    busy_before = np.concatenate(([0.0], np.cumsum(lengths)))
+    # the last segment which starts until each edge
+    index = np.searchsorted(start, edges, side='right') - 1
+    segment = np.maximum(index, 0)
+    busy = busy_before[index + 1] - np.where(
+        index >= 0, lengths[segment] - np.clip(edges - start[segment], 0, lengths[segment]), 0)
+    return np.diff(busy) / np.diff(edges)
+
+
+def gantt_figure(trace: Trace, title: str = '', start: float = None, end: float = None, max_segments: int = 20000,
+                 resolution: int = 2000, new_figure=Figure):
+    """
+    gantt chart of a trace with a row for each cpu. segments are colored by pid. a time window with more segments than
+    max_segments is downsampled to busy fraction of each cpu in time bins, which is one image whatever the number of
+    segments, so a trace of millions of segments is drawn in a moment
+    :param trace: trace of a simulation
+    :param title: title of the chart, like algorithm name
+    :param start: start of the time window. start of the trace by default
+    :param end: end of the time window. end of the trace by default
+    :param max_segments: maximum number of segments which are drawn one by one
+    :param resolution: number of time bins of a downsampled chart
+    :param new_figure: function which creates a figure. Figure by default, pyplot.figure for windows
+    :return: figure
+    """
+    columns = trace.columns()
+    cpu, pid = columns['cpu'], columns['pid']
+    segment_start, segment_end = columns['start'], columns['end']
+    cpus = int(cpu.max()) + 1 if len(cpu) else 1
+    if start is None:
+        start = float(segment_start.min()) if len(cpu) else 0.0
+    if end is None:
+        end = float(segment_end.max()) if len(cpu) else 1.0
+    visible = (segment_end > start) & (segment_start < end)
+
+    figure = new_figure(figsize=(30, min(15, 2 + cpus)))
+    subplot = figure.add_subplot()
+    if np.count_nonzero(visible) <= max_segments:
+        cpu, pid = cpu[visible], pid[visible]
+        left, right = np.maximum(segment_start[visible], start), np.minimum(segment_end[visible], end)
+        # all segments are one collection of rectangles instead of a patch for each of them
+        vertices = np.stack([
+            np.stack([left, cpu - 0.4], axis=1), np.stack([left, cpu + 0.4], axis=1),
+            np.stack([right, cpu + 0.4], axis=1), np.stack([right, cpu - 0.4], axis=1),
+        ], axis=1)
+        colors = matplotlib.colormaps['tab20'](pid % 20)
+        subplot.add_collection(PolyCollection(vertices, facecolors=colors, edgecolors='none'))
+        subplot.set_xlim(start, end)
+        subplot.set_ylim(cpus - 0.5, -0.5)
+        subplot.set_title(f"{title} {len(cpu)} segments")
+    else:
+        edges = np.linspace(start, end, resolution + 1)
+        busy_fraction = np.zeros((cpus, resolution))
+        for i in range(cpus):
+            on_cpu = cpu == i
+            order = np.argsort(segment_start[on_cpu], kind='stable')
+            busy_fraction[i] = _busy_fraction(segment_start[on_cpu][order], segment_end[on_cpu][order], edges)
+        image = subplot.imshow(busy_fraction, aspect='auto', interpolation='nearest', cmap='Greens', vmin=0, vmax=1,
+                               extent=(start, end, cpus - 0.5, -0.5))
+        figure.colorbar(image, ax=subplot, label='busy fraction')
+        subplot.set_title(f"{title} {np.count_nonzero(visible)} segments in {resolution} time bins")
+    subplot.set_yticks(range(cpus))
+    subplot.set_yticklabels([f"cpu {i}" for i in range(cpus)])
+    subplot.set_xlabel('Time')
+    return figure
+
+
+def _save(figure, path) -> Path:
+    figure.savefig(path)
+    # nothing else refers to a figure which pyplot hasn't created, so it's freed after this
+    figure.clear()
+    return Path(path)
+
+
+def save_algorithm_charts(name: str, columns: dict, summary: dict, folder='results/charts/', bins: int = 20) -> list:
+    """
+    render charts of a result to png files priority_<name>.png, burst_<name>.png and arrival_<name>.png
+    :return: paths of charts
+    """
+    return [
+        _save(figure, Path(folder) / f"{chart}_{name}.png")
+        for chart, figure in algorithm_figures(name, columns, summary, bins).items()
+    ]
+
+
+def read_trace(algorithm: str, folder='results/') -> Trace:
+    """
+    read saved trace of an algorithm (results/algorithmname_trace.<format>)
+    :return: Trace or None if the algorithm has no saved trace
+    """
+    for suffix in storage.SUFFIXES.values():
+        path = Path(folder) / f"{algorithm}_trace{suffix}"
+        if path.exists():
+            return Trace.read(path)
+    return None
+
+
+def render_gantt(trace: Trace, path, title: str = '', **options) -> list:
+    """
+    render gantt chart of a trace to a png file
+    :param options: other arguments of gantt_figure like start and end
+    :return: path of the chart in a list
+    """
+    return [_save(gantt_figure(trace, title, **options), path)]
+
+
+def render_result(algorithm: str, folder='results/', bins: int = 20) -> list:
+    """
+    render charts of saved result of an algorithm to charts folder of results folder. a saved trace is rendered to
+    gantt_<algorithm>.png too
+    :return: paths of charts
+    """
+    columns, summary = read_result(algorithm, folder)
+    paths = save_algorithm_charts(algorithm, columns, summary, Path(folder) / "charts", bins)
+    trace = read_trace(algorithm, folder)
+    if trace is not None:
+        paths += render_gantt(trace, Path(folder) / "charts" / f"gantt_{algorithm}.png", algorithm)
+    return paths
+
+
+def render_run(store_path, run_id: str, folder='results/', bins: int = 20) -> list:
+    """
+    render charts of a run of the result store. charts are named <algorithm>_<beginning of run id>
+    :return: paths of charts
+    """
+    store = ResultStore(store_path)
+    try:
+        summary = store.get(run_id)
+        columns = store.load_processes(run_id)
+        algorithm = store.query("run_id = ?", (run_id,), ['algorithm'])['algorithm'][0]
+    finally:
+        store.close()
+    return save_algorithm_charts(f"{algorithm}_{run_id[:8]}", columns, summary, Path(folder) / "charts", bins)
+
+
+def render_comparison(algorithms_df: pd.DataFrame, folder='results/') -> list:
+    """
+    render comparison of algorithms to result.png of results folder
+    :return: path of the chart in a list
+    """
+    return [_save(comparison_figure(algorithms_df), Path(folder) / "result.png")]
+
+
+def render_all(
+        names: list, comparison: pd.DataFrame = None, folder='results/', bins: int = 20, workers: int = None,
+        store_path=None
+) -> list:
+    """
+    render charts of several results and the comparison of them in parallel worker processes
+    :param names: algorithm names of saved results, or run ids of the store if store_path is passed
+    :param comparison: average times of algorithms for the comparison chart (Simulator.compare_algorithms). no
+        comparison chart by default
+    :param folder: folder of results. charts are saved to its charts folder
+    :param bins: maximum number of bars of each chart
+    :param workers: number of worker processes. number of cpus of this machine by default, 1 renders here without
+        worker processes
+    :param store_path: folder of a result store
+    :return: paths of charts
+    """
+    Path(folder, "charts").mkdir(parents=True, exist_ok=True)
+    tasks = [
+        (render_result, name, folder, bins) if store_path is None else (render_run, store_path, name, folder, bins)
+        for name in names
+    ]
+    if comparison is not None:
+        tasks.append((render_comparison, comparison, folder))
+
+    paths = []
+    if workers == 1:
+        for function, *arguments in tasks:
+            paths.extend(function(*arguments))
+        return paths
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = [executor.submit(function, *arguments) for function, *arguments in tasks]
+        for future in futures:
+            paths.extend(future.result())
+    return paths
+
+
+def parse_arguments(args=None):
+    parser = argparse.ArgumentParser(description="render charts of results of simulations without a window")
+    parser.add_argument('algorithms', nargs='*',
+                        help="algorithm names of results. all algorithms which have a result by default")
+    parser.add_argument('--folder', default='results/', help="folder of results")
+    parser.add_argument('--store', default=None, help="render the newest runs of this result store instead")
+    parser.add_argument('--bins', type=int, default=20, help="maximum number of bars of each chart")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of worker processes. number of cpus of this machine by default")
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    arguments = parse_arguments(args)
+    # simulator module imports this module, so it's imported here
+    from simulator import Simulator
+
+    simulator = Simulator("FCFS")
+    if arguments.store is not None:
+        store = ResultStore(arguments.store)
+        runs = store.latest_runs()
+        runs = runs[runs['algorithm'].isin(arguments.algorithms)] if arguments.algorithms else runs
+        # runs which processes of them are not saved have no charts
+        saved = set(store.query("processes_path IS NOT NULL", columns=['run_id'])['run_id'])
+        runs = runs[runs['run_id'].isin(saved)]
+        comparison = simulator.compare_algorithms(store=store, folder=arguments.folder)
+        store.close()
+        names = runs['run_id'].tolist()
+    else:
+        names = arguments.algorithms or [
+            algorithm for algorithm in simulator.algorithms_list
+            if any(Path(arguments.folder, f"{algorithm}{suffix}").exists() for suffix in storage.SUFFIXES.values())
+        ]
+        simulator.algorithms_list = names
+        comparison = simulator.compare_algorithms(folder=arguments.folder)
+
+    paths = render_all(names, comparison, arguments.folder, arguments.bins, arguments.workers, arguments.store)
+    for path in paths:
+        print(path)
+    return True
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,13 @@
+import threading
 import time
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import simpledialog
+from tkinter import ttk
 
 from PIL import ImageTk, Image
 from simulator import Simulator
+from result_cache import ResultCache
 from pathlib import Path
 
 gp_folder = Path('graphics/')
@@ -87,6 +90,90 @@ class AnimatedGIF(tk.Label, object):
         super(AnimatedGIF, self).place_forget(**kwargs)
 
 
+class BackgroundTask(object):
+    """
+    run a long function like a simulation in a background thread, so windows don't freeze while it runs.
+    a window shows progress of it with a cancel button. Tk isn't thread safe, so the thread doesn't touch widgets,
+    the main loop checks the task with after() and calls on_done with the result when it's finished
+    """
+    # milliseconds between checks of the task
+    POLL_DELAY = 100
+
+    def __init__(self, title: str, function, on_done, unit: str = 'processes'):
+        """
+        :param title: title of progress window
+        :param function: function which runs in the thread. it gets a progress function like progress param of
+            Simulator.run
+        :param on_done: function which gets the result of function in the main loop
+        :param unit: what progress counts
+        """
+        self.function = function
+        self.on_done = on_done
+        self.unit = unit
+        self.completed = 0
+        self.total = 0
+        self.cancelled = False
+        self.finished = False
+        self.result = None
+        self.error = None
+
+        self.window = tk.Toplevel()
+        self.window.title(title)
+        self.window.geometry('400x160+550+300')
+        self.window.resizable(0, 0)
+        self.label = tk.Label(self.window, text=f"{title}...", font=("Courier", 14))
+        self.label.pack(pady=10)
+        self.progress_bar = ttk.Progressbar(self.window, length=350, mode='determinate', maximum=1)
+        self.progress_bar.pack()
+        tk.Button(
+            self.window, text='Cancel', font=("chiller", 18), height=1, width=8,
+            bg="maroon3", fg="yellow", command=self.cancel
+        ).pack(pady=10)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+        # other buttons wait until the task is finished
+        self.window.grab_set()
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.window.after(self.POLL_DELAY, self._poll)
+
+    def progress(self, completed: int, total: int) -> bool:
+        # it's called in the thread, widgets are updated in the main loop
+        self.completed = completed
+        self.total = total
+        return not self.cancelled
+
+    def cancel(self):
+        self.cancelled = True
+        self.label.configure(text="Cancelling...")
+
+    def _run(self):
+        try:
+            self.result = self.function(self.progress)
+        except Exception as e:
+            self.error = e
+        self.finished = True
+
+    def _poll(self):
+        if self.total:
+            self.progress_bar['value'] = self.completed / self.total
+            if not self.cancelled:
+                self.label.configure(text=f"{self.completed} of {self.total} {self.unit}")
+        if not self.finished:
+            self.window.after(self.POLL_DELAY, self._poll)
+            return
+
+        self.window.grab_release()
+        self.window.destroy()
+        if self.error is not None:
+            if self.cancelled:
+                messagebox.showinfo("Info", "Simulation is cancelled")
+            else:
+                messagebox.showerror("Error", str(self.error))
+            return
+        self.on_done(self.result)
+
+
 def show_information_page(simulator):
     information_page = tk.Toplevel()
     information_page.geometry('550x450+350+40')
@@ -120,17 +207,17 @@ def show_information_page(simulator):
 
     # rerun algorithm
     def rerun_button():
-        m2 = messagebox.askokcancel("Waiting", "You have to wait until simulation be complete "
-                                               "then your screen will unfreeze!\n Do you want to continue\n"
-                                               "(30-60 seconds need)")
-        if not m2:
-            return 0
-        simulator.read_processes_data()
-        simulator.run()
-        print(simulator.__str__())
-        simulator.save_result_simulation()
-        information_page.destroy()
-        show_information_page(simulator)
+        def simulate(progress):
+            # processes of the simulator are not changed by runs, so they are not read again
+            simulator.run(progress=progress)
+            simulator.save_result_simulation()
+
+        def show_result(_):
+            print(simulator.__str__())
+            information_page.destroy()
+            show_information_page(simulator)
+
+        BackgroundTask(f"Running {simulator.algorithm}", simulate, show_result)
 
     tk.Button(
         information_page, text='Re Run', font=("chiller", 18), height=2, width=8,
@@ -141,6 +228,10 @@ def show_information_page(simulator):
 
 
 def run():
+    # re running an algorithm or analyzing all of them on the same processes gets results from the cache.
+    # it's created here, so importing this module doesn't create its folder
+    result_cache = ResultCache()
+
     main_window = tk.Tk()
     main_window.geometry('850x700+350+40')
     main_window.title("CPU Simulator")
@@ -169,20 +260,18 @@ def run():
             if algorithm not in simulator.algorithms_list:
                 messagebox.showerror("Error", "Invalid Algorithm")
                 return 0
-            m2 = messagebox.askokcancel("Waiting", "You have to wait until simulation be complete "
-                                                   "then your screen will unfreeze!\n Do you want to continue\n"
-                                                   "(30-60 seconds need)")
-            if not m2:
-                return 0
-
             simulator.set_algorithm(algorithm)
-            simulator.read_processes_data()
-            simulator.run()
-            print(simulator.__str__())
-            simulator.save_result_simulation()
 
-            # show information page
-            show_information_page(simulator)
+            def simulate(progress):
+                simulator.run(progress=progress)
+                simulator.save_result_simulation()
+
+            def show_result(_):
+                print(simulator.__str__())
+                # show information page
+                show_information_page(simulator)
+
+            BackgroundTask(f"Running {algorithm}", simulate, show_result)
 
         # algorithm buttons
 
@@ -238,13 +327,22 @@ def run():
                 "Analyzer", "Do you want to run all algorithms first?\n(You have to wait)", icon='warning'
             )
             if m1:
-                for alg in simulator.algorithms_list:
-                    s = Simulator(alg)
-                    s.read_processes_data()
-                    s.run()
-                    print(s.__str__())
-                    s.save_result_simulation()
-            simulator.analyze_algorithms()
+                def simulate(progress):
+                    # processes are read once and algorithms run in parallel
+                    simulators = simulator.run_all(simulator.algorithms_list, progress=progress)
+                    for s in simulators.values():
+                        s.save_result_simulation()
+                    return simulators
+
+                def show_result(simulators):
+                    for s in simulators.values():
+                        print(s.__str__())
+                    # windows of charts are created in the main loop
+                    simulator.analyze_algorithms(simulators)
+
+                BackgroundTask("Running all algorithms", simulate, show_result)
+            else:
+                simulator.analyze_algorithms()
 
         btn_analyzer = tk.Button(
             algorithm_page, text='Analyze All', font=("chiller", 18), height=2, width=10,
@@ -269,7 +367,7 @@ def run():
         if result:
             messagebox.showinfo("Info", f"{number} processes generated in {path}")
             # going to next page
-            simulator = Simulator("FCFS")
+            simulator = Simulator("FCFS", cache=result_cache)
             simulator.read_processes_data()
             algo_page(simulator)
 
@@ -280,7 +378,7 @@ def run():
     # load button
     def load_button_command():
         path = 'data.csv'
-        simulator = Simulator("FCFS")
+        simulator = Simulator("FCFS", cache=result_cache)
         result = simulator.read_processes_data()
         if result:
             messagebox.showinfo("Info", f"{len(simulator.processes)} loaded processes from {path}")
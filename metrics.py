@@ -0,0 +1,283 @@
+"""
+incremental metrics of simulation. they are updated as processes complete, use memory independent of number of
+processes and can be merged, so results of parallel workers can be added together
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+
+class RunningStats(object):
+    """
+    count, mean and variance with welford's algorithm. batches and other stats are merged with chan's formula
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        # sum of squares of differences from the mean
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def add_array(self, values):
+        """
+        add all values of an array at once
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        batch = RunningStats()
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        self.merge(batch)
+
+    def merge(self, other):
+        """
+        add values of another stats to this one
+        :param other: RunningStats
+        """
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """
+        sample variance. 0 for less than 2 values
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch(object):
+    """
+    quantiles with relative error (DDSketch). a value x goes to bucket ceil(log(x) / log(gamma)), so each bucket covers
+    values within relative_accuracy of its middle. memory is number of buckets, which grows with log of range of values
+    not with number of values, and two sketches are merged by adding counts of their buckets
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-9):
+        """
+        :param relative_accuracy: maximum relative error of quantiles
+        :param min_value: values lower than this (zeros and float errors around zero) are counted as zero
+        """
+        if not 0 < relative_accuracy < 1:
+            raise Exception("relative accuracy should be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value < self.min_value:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def add_array(self, values):
+        """
+        add all values of an array at once
+        """
+        values = np.asarray(values, dtype=np.float64)
+        positive = values[values >= self.min_value]
+        self.count += len(values)
+        self.zero_count += len(values) - len(positive)
+        if not len(positive):
+            return
+        indices = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+        offset = int(indices.min())
+        counts = np.bincount(indices - offset)
+        for index in np.flatnonzero(counts).tolist():
+            self.buckets[index + offset] = self.buckets.get(index + offset, 0) + int(counts[index])
+
+    def merge(self, other):
+        """
+        add values of another sketch to this one. both should have the same relative accuracy
+        :param other: QuantileSketch
+        """
+        if other.gamma != self.gamma:
+            raise Exception("sketches with different relative accuracy can't be merged")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """
+        :param q: quantile between 0 and 1. e.g 0.95 for P95
+        :return: the quantile, nan if there is no value
+        """
+        if not 0 <= q <= 1:
+            raise Exception("quantile should be between 0 and 1")
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # middle of the bucket (gamma ** (index - 1), gamma ** index] with relative error
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class MetricsAccumulator(object):
+    """
+    running stats and quantiles of waiting, turnaround and response time of completed processes
+    """
+    METRICS = ('waiting_time', 'turnaround_time', 'response_time')
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        :param relative_accuracy: maximum relative error of quantiles
+        """
+        self.stats = {metric: RunningStats() for metric in self.METRICS}
+        self.sketches = {metric: QuantileSketch(relative_accuracy) for metric in self.METRICS}
+
+    def add(self, waiting_time, turnaround_time, response_time):
+        """
+        add a completed process
+        """
+        for metric, value in zip(self.METRICS, (waiting_time, turnaround_time, response_time)):
+            self.stats[metric].add(value)
+            self.sketches[metric].add(value)
+
+    def add_arrays(self, waiting_time, turnaround_time, response_time):
+        """
+        add completed processes as columns
+        """
+        for metric, values in zip(self.METRICS, (waiting_time, turnaround_time, response_time)):
+            self.stats[metric].add_array(values)
+            self.sketches[metric].add_array(values)
+
+    def merge(self, other):
+        """
+        add processes of another accumulator to this one, e.g. an accumulator of a worker process
+        :param other: MetricsAccumulator
+        """
+        for metric in self.METRICS:
+            self.stats[metric].merge(other.stats[metric])
+            self.sketches[metric].merge(other.sketches[metric])
+
+    @property
+    def count(self) -> int:
+        return self.stats['waiting_time'].count
+
+    def mean(self, metric: str) -> float:
+        return self.stats[metric].mean
+
+    def quantile(self, metric: str, q: float) -> float:
+        return self.sketches[metric].quantile(q)
+
+    def json_export(self) -> dict:
+        """
+        :return: std and quantiles of each metric like {"waiting_time_std": ..., "waiting_time_p95": ..., ...}
+        """
+        result = {}
+        for metric in self.METRICS:
+            result[f"{metric}_std"] = self.stats[metric].std
+            for q in self.QUANTILES:
+                result[f"{metric}_p{round(q * 100)}"] = self.sketches[metric].quantile(q)
+        return result
+
+
+def bin_metrics(values, metrics: dict, bins: int = 20, quantiles: tuple = ()) -> pd.DataFrame:
+    """
+    mean (and quantiles) of metrics of processes in bins of a column, in one pass over the columns.
+    integer columns with up to `bins` different values get a bin for each value, like priorities. other columns are
+    divided to `bins` ranges of the same width between their minimum and maximum
+    :param values: column which processes are binned by, like burst_time
+    :param metrics: dict of metric name and its column, like {"waiting_time": ...}
+    :param bins: number of bins
+    :param quantiles: quantiles of each bin, e.g. (0.5, 0.95). they are metric_p50 and metric_p95 columns
+    :return: dataframe with a row for each bin which has processes and a column for each metric (and quantile).
+        index is the value of a bin or "low-high" range of it
+    """
+    if bins < 1:
+        raise Exception("number of bins should be at least 1")
+    values = np.asarray(values)
+    if not len(values):
+        return pd.DataFrame(columns=list(metrics))
+    low, high = values.min(), values.max()
+
+    if values.dtype.kind in 'iub' and high - low < bins:
+        # a bin for each value
+        codes = (values - low).astype(np.intp)
+        size = int(high - low) + 1
+        labels = np.arange(low, high + 1)
+    else:
+        size = bins
+        width = (high - low) / bins
+        if width > 0:
+            codes = ((values - low) / width).astype(np.intp)
+            # maximum is in the last bin
+            np.minimum(codes, bins - 1, out=codes)
+        else:
+            codes = np.zeros(len(values), dtype=np.intp)
+        edges = low + width * np.arange(bins + 1)
+        labels = np.array([f"{edges[i]:g}-{edges[i + 1]:g}" for i in range(bins)])
+
+    counts = np.bincount(codes, minlength=size)
+    data = {}
+    for name, column in metrics.items():
+        column = np.asarray(column, dtype=np.float64)
+        # processes which haven't executed have no metrics
+        finite = np.isfinite(column)
+        sums = np.bincount(codes, weights=np.where(finite, column, 0), minlength=size)
+        finite_counts = np.bincount(codes, weights=finite, minlength=size)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            data[name] = sums / finite_counts
+
+    if quantiles:
+        # processes are grouped by bin with one sort of bin numbers, small integers are sorted by radix sort
+        order = np.argsort(codes.astype(np.int16) if size <= np.iinfo(np.int16).max else codes, kind='stable')
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        for name, column in metrics.items():
+            grouped = np.asarray(column, dtype=np.float64)[order]
+            result = np.full((size, len(quantiles)), np.nan)
+            for i in np.flatnonzero(counts).tolist():
+                group = grouped[bounds[i]:bounds[i + 1]]
+                group = group[np.isfinite(group)]
+                if len(group):
+                    result[i] = np.quantile(group, quantiles)
+            for j, q in enumerate(quantiles):
+                data[f"{name}_p{round(q * 100)}"] = result[:, j]
+
+    used = counts > 0
+    return pd.DataFrame({name: column[used] for name, column in data.items()}, index=labels[used])
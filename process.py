@@ -1,3 +1,10 @@
+import hashlib
+
+import numpy as np
+
+import storage
+
+
 class State:
     """ Process states enum """
     WAITING = 0
@@ -26,6 +33,12 @@ class State:
 
 
 class Process:
+    # no __dict__ for each process. It saves memory when we have lots of process objects
+    __slots__ = (
+        'pid', 'arrival_time', 'priority', 'burst_time', 'response_time', 'waiting_time', 'turnaround_time',
+        'start_time', 'end_time', 'remaining_time', 'state'
+    )
+
     def __init__(self, pid, arrival_time, priority, burst_time, state=State.READY):
         """
         :param pid: id of process
@@ -53,3 +66,278 @@ class Process:
                f" 'start_time': {self.start_time} | 'end_time': {self.end_time} |" \
                f" 'remaining_time': {self.remaining_time} | 'state': {self.state}"
 
+
+# columns of a workload and their types. times can be float, but whole numbers are kept as integers
+WORKLOAD_DTYPES = {
+    'pid': np.int64,
+    'arrival_time': np.float64,
+    'priority': np.int64,
+    'burst_time': np.float64,
+}
+
+
+class ProcessTable(object):
+    """
+    processes as struct of arrays. each attribute is a typed numpy column instead of an attribute of a Process object,
+    so big workloads use a few arrays instead of millions of objects. row i of every column is the same process.
+    columns of processes are a read only snapshot, a run just sets result columns. so a table can be run again and
+    again, and copies of it share columns of processes
+    """
+
+    WORKLOAD_COLUMNS = ('pid', 'arrival_time', 'priority', 'burst_time')
+    # columns of result of a run. they are created when they are used first, so a big table opens instantly
+    RESULT_COLUMNS = ('remaining_time', 'start_time', 'end_time', 'state')
+
+    def __init__(self, pid, arrival_time, priority, burst_time, typed: bool = False, source=None):
+        """
+        :param pid: ids of processes
+        :param arrival_time: times of entering
+        :param priority: priorities
+        :param burst_time: times that need to executed
+        :param typed: columns already have types of a table (e.g. columns of a saved table), so they are used as they
+            are without checking or copying them
+        :param source: path of a memory mapped file of the columns. a pickled table (e.g. for worker processes) opens
+            the file again instead of copying the columns
+        """
+        if typed:
+            self.pid = pid
+            self.arrival_time = arrival_time
+            self.priority = priority
+            self.burst_time = burst_time
+        else:
+            self.pid = np.asarray(pid, dtype=np.int64)
+            self.arrival_time = self._time_column(arrival_time)
+            self.priority = np.asarray(priority, dtype=np.int64)
+            self.burst_time = self._time_column(burst_time)
+        self._freeze()
+        self.source = source
+        self._hash = None
+        # False until arrival order is computed, None if processes are sorted by arrival time
+        self._arrival_order = False
+
+        if not len(self.pid) == len(self.arrival_time) == len(self.priority) == len(self.burst_time):
+            raise Exception("all columns of process table should have the same length")
+
+    def __getattr__(self, name):
+        # it's called just for attributes which don't exist, like result columns which are not created yet
+        if name not in self.RESULT_COLUMNS:
+            raise AttributeError(name)
+        size = len(self.pid)
+        if name == 'remaining_time':
+            value = self.burst_time.astype(np.float64)
+        elif name == 'state':
+            value = np.full(size, State.READY, dtype=np.int8)
+        else:
+            value = np.full(size, np.nan)
+        setattr(self, name, value)
+        return value
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.source is not None:
+            # columns are opened from the file again
+            for column in self.WORKLOAD_COLUMNS:
+                del state[column]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.source is not None:
+            columns = storage.read_columns(self.source, list(self.WORKLOAD_COLUMNS))
+            self.__dict__.update(columns)
+        self._freeze()
+
+    def _freeze(self):
+        """
+        columns of processes are read only views, arrays that the table is created from stay writable
+        """
+        for column in self.WORKLOAD_COLUMNS:
+            view = getattr(self, column).view()
+            view.flags.writeable = False
+            setattr(self, column, view)
+
+    @staticmethod
+    def _time_column(values) -> np.ndarray:
+        """
+        integer times stay integer (like csv files), other numbers are float.
+        float columns which only have whole numbers are integer too
+        """
+        values = np.asarray(values)
+        if values.dtype.kind in 'iub':
+            return values.astype(np.int64, copy=False)
+        values = values.astype(np.float64, copy=False)
+        if np.all(np.isfinite(values)) and np.array_equal(values, np.floor(values)) \
+                and (not len(values) or np.abs(values).max() < 2 ** 53):
+            return values.astype(np.int64)
+        return values
+
+    @classmethod
+    def from_processes(cls, processes: list):
+        """
+        create table from list of process objects
+        :param processes: list of processes
+        :return: ProcessTable
+        """
+        return cls(
+            pid=[process.pid for process in processes],
+            arrival_time=[process.arrival_time for process in processes],
+            priority=[process.priority for process in processes],
+            burst_time=[process.burst_time for process in processes]
+        )
+
+    @classmethod
+    def from_columns(cls, columns: dict, source=None):
+        """
+        create table from columns of a file. columns which already have types of a table are used without a copy,
+        like memory mapped columns of a saved table
+        :param columns: dict of column name and array
+        :param source: path of the file if columns are memory mapped
+        :return: ProcessTable
+        """
+        # other columns are checked and converted like a new table
+        typed = source is not None and columns['pid'].dtype == np.int64 and columns['priority'].dtype == np.int64 \
+            and all(columns[column].dtype in (np.int64, np.float64) for column in ('arrival_time', 'burst_time'))
+        return cls(
+            pid=columns['pid'],
+            arrival_time=columns['arrival_time'],
+            priority=columns['priority'],
+            burst_time=columns['burst_time'],
+            typed=typed,
+            source=source if typed else None
+        )
+
+    def hash(self) -> str:
+        """
+        hash of columns of processes, so the same workload has the same hash wherever it's loaded from.
+        It's computed once, columns of processes don't change
+        :return: hex digest
+        """
+        if self._hash is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for column in (self.pid, self.arrival_time, self.priority, self.burst_time):
+                # type is hashed too, integer and float times of the same numbers are different workloads
+                digest.update(column.dtype.str.encode())
+                digest.update(np.ascontiguousarray(column).data)
+            self._hash = digest.hexdigest()
+        return self._hash
+
+    def copy(self):
+        """
+        a table of the same processes without result. columns of processes are shared, runs don't change them
+        :return: ProcessTable
+        """
+        table = ProcessTable(self.pid, self.arrival_time, self.priority, self.burst_time, typed=True, source=self.source)
+        table._hash = self._hash
+        table._arrival_order = self._arrival_order
+        return table
+
+    def arrival_order(self):
+        """
+        indices of processes sorted by arrival time. the sort is stable, so processes with the same arrival time keep
+        their order. It's sorted once for a table and all its copies, so runs of a workload don't sort it again
+        :return: array of indices or None if processes are already sorted by arrival time
+        """
+        if self._arrival_order is False:
+            arrival_time = self.arrival_time
+            if np.all(arrival_time[1:] >= arrival_time[:-1]):
+                self._arrival_order = None
+            else:
+                self._arrival_order = np.argsort(arrival_time, kind='stable')
+                self._arrival_order.flags.writeable = False
+        return self._arrival_order
+
+    def sorted_by_arrival(self):
+        """
+        a table of the same processes sorted by arrival time, so algorithms don't gather columns in arrival order for
+        each run
+        :return: ProcessTable. this table if it's already sorted
+        """
+        order = self.arrival_order()
+        if order is None:
+            return self
+        table = ProcessTable(
+            self.pid[order], self.arrival_time[order], self.priority[order], self.burst_time[order], typed=True)
+        table._arrival_order = None
+        return table
+
+    def validate(self) -> bool:
+        """
+        check values of all processes at once
+        :return: a true boolean if everythings goes right
+        """
+        for column in ('arrival_time', 'burst_time'):
+            values = getattr(self, column)
+            if not np.all(np.isfinite(values)):
+                raise Exception(f"{column} of processes should be a number")
+            if len(values) and values.min() < 0:
+                raise Exception(f"{column} of processes can't be negative")
+        # pids of generated workloads are increasing, so sorting is not needed for them
+        pid = self.pid if np.all(self.pid[1:] > self.pid[:-1]) else np.sort(self.pid)
+        if np.any(pid[1:] == pid[:-1]):
+            raise Exception("pid of processes should be unique")
+        return True
+
+    def apply_result(self, result: dict) -> dict:
+        """
+        save result of an array engine (algorithms.vectorized) to the columns
+        :param result: output of an array engine
+        :return: same dict as output of algorithms run method. executed_processes is row indices of the table
+        """
+        # new columns for each run, columns of a previous run may be shared with a cached result
+        self.start_time = np.asarray(result['start_time'], dtype=np.float64)
+        self.end_time = np.asarray(result['end_time'], dtype=np.float64)
+        self.remaining_time = np.zeros(len(self.pid))
+        state = np.full(len(self.pid), State.READY, dtype=np.int8)
+        state[result['order']] = State.EXECUTED
+        self.state = state
+        return {
+            "executed_processes": result['order'],
+            "cpu_total_time": result['cpu_total_time'],
+            "cpu_idle_time": result['cpu_idle_time'],
+            "cpu_busy_time": result.get('cpu_busy_time', [result['cpu_total_time'] - result['cpu_idle_time']]),
+            "migrations": result.get('migrations', 0),
+        }
+
+    @property
+    def turnaround_time(self) -> np.ndarray:
+        return self.end_time - self.arrival_time
+
+    @property
+    def waiting_time(self) -> np.ndarray:
+        return self.end_time - self.arrival_time - self.burst_time
+
+    @property
+    def response_time(self) -> np.ndarray:
+        return self.start_time - self.arrival_time
+
+    def to_processes(self, indices=None) -> list:
+        """
+        object view of processes, for when objects are needed
+        :param indices: row indices of processes. all of them by default
+        :return: list of processes
+        """
+        if indices is None:
+            indices = range(len(self.pid))
+
+        processes = []
+        for i in indices:
+            process = Process(
+                pid=int(self.pid[i]),
+                arrival_time=self.arrival_time[i].item(),
+                priority=int(self.priority[i]),
+                burst_time=self.burst_time[i].item(),
+                state=int(self.state[i])
+            )
+            process.remaining_time = self.remaining_time[i].item()
+            if not np.isnan(self.start_time[i]):
+                process.start_time = self.start_time[i].item()
+                process.response_time = process.start_time - process.arrival_time
+            if not np.isnan(self.end_time[i]):
+                process.end_time = self.end_time[i].item()
+                process.turnaround_time = process.end_time - process.arrival_time
+                process.waiting_time = process.turnaround_time - process.burst_time
+            processes.append(process)
+        return processes
+
+    def __len__(self):
+        return len(self.pid)
@@ -0,0 +1,145 @@
+"""
+cache of results of simulations. a result is found by a hash of the workload, algorithm class, its parameters, cpus
+and version of the scheduling kernel, so the same run isn't simulated twice.
+results are kept in memory for this process and in files on disk for next processes. both layers evict the least
+recently used results when they are bigger than their limit
+"""
+import copy
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+
+from algorithms.kernel import ENGINE_VERSION
+from pathlib import Path
+
+
+def _result_size(result: dict) -> int:
+    """
+    approximate memory of a result. its columns are the most of it
+    """
+    return sum(value.nbytes for value in result.values() if isinstance(value, np.ndarray))
+
+
+class ResultCache(object):
+    """
+    two level LRU cache of results of Simulator (output of Simulator.get_result)
+    """
+
+    def __init__(self, path='results/cache', max_disk_bytes: int = 2 ** 30, max_memory_bytes: int = 2 ** 28):
+        """
+        :param path: folder of cached results
+        :param max_disk_bytes: maximum size of files of the folder
+        :param max_memory_bytes: maximum size of results which are kept in memory
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(processes, algorithm_class, parameters: dict = None, cpus: int = 1) -> str:
+        """
+        :param processes: ProcessTable of the workload
+        :param algorithm_class: class of the algorithm
+        :param parameters: parameters of the algorithm class
+        :param cpus: number of cpus
+        :return: hex digest
+        """
+        key = json.dumps({
+            "workload": processes.hash(),
+            "algorithm": f"{algorithm_class.__module__}.{algorithm_class.__qualname__}",
+            "parameters": parameters or {},
+            "cpus": cpus,
+            "engine": ENGINE_VERSION,
+        }, sort_keys=True)
+        return hashlib.blake2b(key.encode(), digest_size=20).hexdigest()
+
+    def get(self, key: str) -> dict:
+        """
+        :param key: key of the result
+        :return: the result or None if it's not cached. columns of the result are read only
+        """
+        result = self._memory.get(key)
+        if result is not None:
+            self._memory.move_to_end(key)
+        else:
+            file_path = self.path / f"{key}.pkl"
+            try:
+                with open(file_path, 'rb') as file:
+                    result = pickle.load(file)
+            except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+                self.misses += 1
+                return None
+            # last access time of a file is its modification time, for LRU eviction of the folder
+            os.utime(file_path)
+            self._remember(key, result)
+        self.hits += 1
+        # metrics may be merged into by the caller, columns are read only
+        return {**result, "metrics": copy.deepcopy(result['metrics'])}
+
+    def put(self, key: str, result: dict):
+        """
+        :param key: key of the result
+        :param result: output of Simulator.get_result
+        """
+        result = dict(result)
+        for name, value in result.items():
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+                value.flags.writeable = False
+                result[name] = value
+        result['metrics'] = copy.deepcopy(result['metrics'])
+
+        # a temporary file is renamed, so other processes never read a half written file
+        file_path = self.path / f"{key}.pkl"
+        temporary_path = self.path / f"{key}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as file:
+            pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, file_path)
+        self._remember(key, result)
+        self._evict_files()
+
+    def _remember(self, key: str, result: dict):
+        size = _result_size(result)
+        if key in self._memory:
+            self._memory_bytes -= _result_size(self._memory.pop(key))
+        if size > self.max_memory_bytes:
+            return
+        self._memory[key] = result
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= _result_size(evicted)
+
+    def _evict_files(self):
+        files = [entry for entry in os.scandir(self.path) if entry.name.endswith('.pkl')]
+        total_bytes = sum(entry.stat().st_size for entry in files)
+        if total_bytes <= self.max_disk_bytes:
+            return
+        # the least recently used files first
+        for entry in sorted(files, key=lambda entry: entry.stat().st_mtime):
+            if total_bytes <= self.max_disk_bytes:
+                break
+            total_bytes -= entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """
+        remove all cached results
+        """
+        self._memory.clear()
+        self._memory_bytes = 0
+        for entry in os.scandir(self.path):
+            if entry.name.endswith('.pkl'):
+                os.remove(entry.path)
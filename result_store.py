@@ -0,0 +1,167 @@
+"""
+embedded store of results of simulations. summaries of runs are rows of a sqlite table and columns of processes of
+each run are a columnar file next to it. a run is found by its run id, a hash of workload, algorithm, parameters, cpus
+and seed, so runs of different workloads or parameters don't overwrite each other
+"""
+import hashlib
+import json
+import sqlite3
+import time
+
+import pandas as pd
+
+import storage  # local module
+from pathlib import Path
+
+# numeric columns of summary of a run, same names as Simulator.json_export
+SUMMARY_COLUMNS = (
+    'total_process', 'load_time', 'run_time', 'cpu_total_time', 'cpu_run_time', 'cpu_time_unit',
+    'cpu_time_unit_variance', 'throughput', 'cpu_utilization', 'migrations',
+    'average_waiting_time', 'average_turnaround_time', 'average_response_time',
+    'waiting_time_std', 'waiting_time_p50', 'waiting_time_p95', 'waiting_time_p99',
+    'turnaround_time_std', 'turnaround_time_p50', 'turnaround_time_p95', 'turnaround_time_p99',
+    'response_time_std', 'response_time_p50', 'response_time_p95', 'response_time_p99',
+)
+# columns of processes which are saved for each run
+PROCESS_COLUMNS = (
+    'pid', 'arrival_time', 'priority', 'burst_time', 'start_time', 'end_time', 'waiting_time', 'turnaround_time',
+    'response_time'
+)
+
+
+def get_run_id(workload_hash: str, algorithm: str, parameters: dict = None, cpus: int = 1, seed=None) -> str:
+    """
+    :param workload_hash: hash of processes (ProcessTable.hash)
+    :param algorithm: algorithm name
+    :param parameters: parameters of algorithm class
+    :param cpus: number of cpus
+    :param seed: seed of the workload, None if it's not generated
+    :return: hex digest
+    """
+    key = json.dumps({
+        "workload": workload_hash,
+        "algorithm": algorithm,
+        "parameters": parameters or {},
+        "cpus": cpus,
+        "seed": seed,
+    }, sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class ResultStore(object):
+    """
+    sqlite table of runs with indexes on workload, algorithm and time of runs, and a folder of columns of processes
+    """
+
+    def __init__(self, path='results/store', file_format: str = 'npy'):
+        """
+        :param path: folder of the store. runs.sqlite and processes folder are in it
+        :param file_format: format of columns of processes. npy (memory mapped when it's read), parquet or arrow
+        """
+        if file_format not in storage.SUFFIXES or file_format == 'csv':
+            raise Exception("file format of the store should be npy, parquet or arrow")
+        self.path = Path(path)
+        self.file_format = file_format
+        (self.path / "processes").mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path / "runs.sqlite"))
+        self._create_tables()
+
+    def _create_tables(self):
+        summary_columns = ''.join(f", {column} REAL" for column in SUMMARY_COLUMNS)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "run_id TEXT PRIMARY KEY, workload_hash TEXT NOT NULL, algorithm TEXT NOT NULL, "
+                "parameters TEXT NOT NULL, cpus INTEGER NOT NULL, seed INTEGER, created_at REAL NOT NULL, "
+                f"processes_path TEXT{summary_columns}, summary TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS runs_workload ON runs (workload_hash, algorithm, parameters, cpus)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS runs_algorithm ON runs (algorithm, cpus)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS runs_created_at ON runs (created_at)")
+
+    def save(self, simulator, seed=None, save_processes: bool = True) -> str:
+        """
+        save result of a simulator. a run with the same run id is replaced
+        :param simulator: a Simulator which has run
+        :param seed: seed of the workload
+        :param save_processes: save columns of processes too
+        :return: run id
+        """
+        processes = simulator.processes
+        workload_hash = processes.hash()
+        run_id = get_run_id(workload_hash, simulator.algorithm, simulator.parameters, simulator.cpus, seed)
+        summary = simulator.json_export()
+
+        processes_path = None
+        if save_processes:
+            processes_path = f"processes/{run_id}{storage.SUFFIXES[self.file_format]}"
+            storage.write_columns(self.path / processes_path, {
+                column: getattr(processes, column) for column in PROCESS_COLUMNS
+            })
+
+        columns = ['run_id', 'workload_hash', 'algorithm', 'parameters', 'cpus', 'seed', 'created_at',
+                   'processes_path', *SUMMARY_COLUMNS, 'summary']
+        values = [
+            run_id, workload_hash, simulator.algorithm, json.dumps(simulator.parameters, sort_keys=True),
+            simulator.cpus, seed, time.time(), processes_path,
+            *(summary.get(column) for column in SUMMARY_COLUMNS), json.dumps(summary)
+        ]
+        with self.connection:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO runs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                values
+            )
+        return run_id
+
+    def get(self, run_id: str) -> dict:
+        """
+        :param run_id: run id
+        :return: summary of the run (same as Simulator.json_export) or None if there is no such run
+        """
+        row = self.connection.execute("SELECT summary FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def load_processes(self, run_id: str) -> dict:
+        """
+        :param run_id: run id
+        :return: dict of column name and array of processes of the run, in the order of the workload
+        """
+        row = self.connection.execute("SELECT processes_path FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None or row[0] is None:
+            raise Exception("processes of this run are not saved")
+        return storage.read_columns(self.path / row[0])
+
+    def query(self, where: str = None, parameters: tuple = (), columns: list = None) -> pd.DataFrame:
+        """
+        find runs with a sql condition, e.g. query("algorithm = ? AND cpus > 1", ("RR",))
+        :param where: condition of sql where clause. all runs by default
+        :param parameters: values of ? placeholders of the condition
+        :param columns: columns of the result. run id, workload, algorithm, parameters, cpus, seed, time and summary
+            columns by default
+        :return: dataframe of runs, the newest first
+        """
+        if columns is None:
+            columns = ['run_id', 'workload_hash', 'algorithm', 'parameters', 'cpus', 'seed', 'created_at',
+                       *SUMMARY_COLUMNS]
+        sql = f"SELECT {', '.join(columns)} FROM runs"
+        if where:
+            sql += f" WHERE {where}"
+        sql += " ORDER BY created_at DESC"
+        return pd.read_sql_query(sql, self.connection, params=parameters)
+
+    def latest_runs(self, workload_hash: str = None) -> pd.DataFrame:
+        """
+        the newest run of each algorithm, parameters and cpus, e.g. for comparing algorithms on a workload
+        :param workload_hash: hash of a workload. all workloads by default
+        :return: same as query function
+        """
+        where = "created_at = (SELECT MAX(created_at) FROM runs AS newer WHERE newer.algorithm = runs.algorithm " \
+                "AND newer.parameters = runs.parameters AND newer.cpus = runs.cpus" \
+                + (" AND newer.workload_hash = runs.workload_hash)" if workload_hash else ")")
+        if workload_hash:
+            return self.query(f"workload_hash = ? AND {where}", (workload_hash,))
+        return self.query(where)
+
+    def close(self):
+        self.connection.close()
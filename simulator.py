@@ -1,141 +1,248 @@
-import random
+import itertools
+import json
+import multiprocessing
+import statistics
 import time
 import algorithms  # local module
+import numpy as np
 import pandas as pd
-from graphics import graphic as simulation_graphic
 
-from process import Process
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from algorithms.trace import Trace
+from process import Process, ProcessTable, WORKLOAD_DTYPES
+from metrics import MetricsAccumulator
+from result_store import ResultStore
+from result_cache import ResultCache
 from pathlib import Path
+import storage  # local module
+import charts  # local module
+from workload import WorkloadGenerator
 
 
-def get_cpu_time_unit():
+# persisted calibration of cpu time unit. It's loaded instead of calibrating again if it exists
+CPU_TIME_UNIT_PATH = Path("results/cpu_time_unit.json")
+# calibration of this process. calibration is done once per process
+_cpu_time_unit_calibration = None
+
+
+def _cpu_time_unit_trial():
     """
-    a unit of time independent on cpu run this code for simulating time
+    run the unit of work once and measure it
     """
-
-    started_at = time.time()
+    started_at = time.perf_counter()
     for i in range(1, 10000):
         if i % 2 == 0:
             temp = i / 2
         else:
             temp = 2 * i
 
-    ended_at = time.time()
+    ended_at = time.perf_counter()
     return ended_at - started_at
 
 
+def calibrate_cpu_time_unit(trials: int = 21) -> dict:
+    """
+    measure the unit of time several times and use median of them, so one slow trial doesn't change the unit
+    :param trials: number of times that unit of work is measured
+    :return: {"cpu_time_unit": median of trials, "cpu_time_unit_variance": variance of trials, "trials": trials}
+    """
+    # first trial warms up the interpreter and is not counted
+    _cpu_time_unit_trial()
+    samples = [_cpu_time_unit_trial() for _ in range(trials)]
+    return {
+        "cpu_time_unit": statistics.median(samples),
+        "cpu_time_unit_variance": statistics.variance(samples) if trials > 1 else 0.0,
+        "trials": trials,
+    }
+
+
+def get_cpu_time_unit_calibration(path=CPU_TIME_UNIT_PATH) -> dict:
+    """
+    calibration of cpu time unit. It's loaded from the persisted file if there is one, otherwise it's calibrated.
+    the result is cached for this process
+    :param path: path of persisted calibration
+    :return: same as calibrate_cpu_time_unit function
+    """
+    global _cpu_time_unit_calibration
+    if _cpu_time_unit_calibration is None:
+        try:
+            with open(path) as file:
+                _cpu_time_unit_calibration = json.load(file)
+        except FileNotFoundError:
+            _cpu_time_unit_calibration = calibrate_cpu_time_unit()
+    return _cpu_time_unit_calibration
+
+
+def save_cpu_time_unit_calibration(path=CPU_TIME_UNIT_PATH) -> bool:
+    """
+    persist calibration of this process, so next runs on this host use the same unit
+    :param path: path to save json file
+    :return: bool
+    """
+    with open(path, 'w') as file:
+        json.dump(get_cpu_time_unit_calibration(path), file, indent=4)
+    return True
+
+
+def get_cpu_time_unit():
+    """
+    a unit of time independent on cpu run this code for simulating time
+    """
+    return get_cpu_time_unit_calibration()['cpu_time_unit']
+
+
+# workload of a worker process of Simulator.run_all. It's sent once to each worker
+_worker_processes = None
+# cancel flag of all workers and completed processes of each algorithm of Simulator.run_all
+_worker_cancelled = None
+_worker_completed = None
+
+
+def _init_worker(processes: ProcessTable, calibration: dict, cancelled=None, completed=None):
+    """
+    initialize a worker process with the workload and cpu time unit of the main process
+    :param cancelled: multiprocessing Event. running algorithms are stopped when it's set
+    :param completed: multiprocessing Array which workers write number of completed processes of each algorithm to
+    """
+    global _worker_processes, _cpu_time_unit_calibration, _worker_cancelled, _worker_completed
+    _worker_processes = processes
+    _cpu_time_unit_calibration = calibration
+    _worker_cancelled = cancelled
+    _worker_completed = completed
+
+
+def _run_algorithm(algorithm: str, cpus: int, processes: ProcessTable = None, progress=None, slot: int = None) -> dict:
+    """
+    run an algorithm on a copy of the workload
+    :param algorithm: algorithm name
+    :param cpus: number of cpus
+    :param processes: workload. workload of the worker process by default
+    :param progress: progress function of Simulator.run
+    :param slot: index of the algorithm in completed processes of the worker. progress of the run is written there
+        and the run is cancelled when cancel flag of the worker is set
+    :return: compact result. summary of simulation and result columns, no process objects
+    """
+    if slot is not None:
+        def progress(completed, _):
+            _worker_completed[slot] = completed
+            return not _worker_cancelled.is_set()
+
+    simulator = Simulator(algorithm, cpus)
+    simulator.processes = (processes if processes is not None else _worker_processes).copy()
+    simulator.run(progress)
+    return simulator.get_result()
+
+
+def _run_grid_point(algorithm: str, point: dict, processes: ProcessTable = None) -> dict:
+    """
+    run an algorithm with parameters of a grid point on a copy of the workload
+    :param algorithm: algorithm name
+    :param point: parameters of algorithm class. cpus is number of cpus of the simulation
+    :param processes: workload. workload of the worker process by default
+    :return: a row of sweep result. parameters of the point and summary of simulation
+    """
+    parameters = dict(point)
+    cpus = parameters.pop('cpus', 1)
+    simulator = Simulator(algorithm, cpus, parameters)
+    simulator.processes = (processes if processes is not None else _worker_processes).copy()
+    simulator.run()
+    summary = simulator.json_export()
+    # a tidy row has one value in each column. the workload is loaded once by the main process, not for a point
+    del summary['cpu_utilizations'], summary['parameters'], summary['load_time']
+    return {"algorithm": algorithm, **point, **summary}
+
+
+# metrics of a replication which are summarized over replications
+REPLICATION_METRICS = (
+    'average_waiting_time', 'average_turnaround_time', 'average_response_time', 'throughput',
+    'waiting_time_p95', 'waiting_time_p99', 'response_time_p95', 'response_time_p99'
+)
+# 97.5% quantiles of student's t distribution for 1 to 30 degrees of freedom, for 95% confidence intervals
+_T_QUANTILES = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+
+
+def _t_quantile(degrees_of_freedom: int) -> float:
+    """
+    97.5% quantile of student's t distribution. more than 30 degrees of freedom uses cornish-fisher expansion of
+    normal quantile which is accurate to 3 decimals there
+    """
+    if degrees_of_freedom <= len(_T_QUANTILES):
+        return _T_QUANTILES[degrees_of_freedom - 1]
+    z = 1.959964
+    n = degrees_of_freedom
+    return z + (z ** 3 + z) / (4 * n) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * n ** 2)
+
+
+def _run_replication(algorithm_names: list, seed, cpus: int, workload: dict) -> list:
+    """
+    generate a workload in memory and run algorithms on it. all algorithms of a replication get the same workload
+    :param algorithm_names: names of algorithms
+    :param seed: seed of the workload
+    :param cpus: number of cpus
+    :param workload: arguments of Simulator.generate_processes
+    :return: list of metrics of each algorithm, in the order of REPLICATION_METRICS. no columns of processes
+    """
+    processes = Simulator.generate_processes(seed=seed, **workload)
+    metrics = []
+    for algorithm in algorithm_names:
+        simulator = Simulator(algorithm, cpus)
+        simulator.processes = processes.copy()
+        simulator.run()
+        summary = simulator.json_export()
+        metrics.append([summary[metric] for metric in REPLICATION_METRICS])
+    return metrics
+
+
 class Simulator:
 
-    def __init__(self, algorithm: str):
+    def __init__(self, algorithm: str, cpus: int = 1, parameters: dict = None, cache: ResultCache = None):
         """
         run_time attr is for running algorithm in second
+        load_time attr is for reading processes data in second
         cpu_total_time is total time of running processes for cpu. The number doesn't have any unit
         cpu_run_time attr total time of running processes for cpu. unit of time depend on get_cpu_time_unit function
+        cpu_time_unit and cpu_time_unit_variance attrs are calibration of that unit for comparing hosts
+        cpu_utilization is utilization of all cpus together and cpu_utilizations is utilization of each cpu
+        migrations is number of times that a process continued on another cpu
+        metrics attr is running stats and quantiles of waiting, turnaround and response time of completed processes
+        cache_hit attr is True if result of last run came from the cache
+        trace attr is run segments of processes of last run (algorithms.trace.Trace) if it's recorded
 
         :param algorithm: algorithm name that valid in algorithm list
+        :param cpus: number of cpus
+        :param parameters: keyword arguments of algorithm class like quantum_number of RR. defaults of class by default
+        :param cache: cache of results. the same workload, algorithm, parameters and cpus isn't simulated again.
+            no cache by default
         """
         self.algorithm = algorithm
+        self.cpus = cpus
+        self.parameters = parameters or {}
         self.algorithm_class = self.get_algorithm_class()
         self.algorithms_list = ["FCFS", "NonPreemptiveSFJ", "PreemptiveSFJ", "RR",
                                 "NonPreemptivePriority", "PreemptivePriority"]
         self.processes = []
         self.total_process = 0
+        self.load_time = 0
         self.run_time = 0
         self.cpu_run_time = 0
         self.cpu_total_time = 0
+        self.cpu_time_unit = 0
+        self.cpu_time_unit_variance = 0
         self.cpu_utilization = 0
+        self.cpu_utilizations = []
+        self.migrations = 0
         self.throughput = 0
         self.average_waiting_time = 0.0
         self.average_turnaround_time = 0.0
         self.average_response_time = 0.0
-
-    def _compress_df_rows(self, df: pd.DataFrame, column: str) -> pd.DataFrame:
-        """
-        you can compress your dataframe based on your column name.
-        for example you have 1000 rows that their priority column have value of 0
-        so you average values of all other columns and compress 1000 rows to one
-        :param df: dataframe which you want to compress same column values
-        :param column: the column that you want to compress values
-        :return: compressed dataframe
-        """
-        # raise error if column not in compress columns
-        if column not in ('priority', 'burst_time', 'arrival_time'):
-            raise KeyError("Your column not valid")
-
-        df = df.sort_values(column, ignore_index=True)
-        unique_columns = list(df[column].unique())
-
-        data = []
-        # compress column based on column name
-        if column == "priority":
-            # mean over each priority
-            for c in unique_columns:
-                result = df.where(df[column] == c).mean(numeric_only=True)
-                data.append([
-                    result['waiting_time'],
-                    result['turnaround_time'],
-                    result['response_time']
-                ])
-            # create dataframe
-            compress_df = pd.DataFrame(
-                data,
-                columns=['waiting_time', 'turnaround_time', 'response_time'],
-                index=unique_columns)
-
-        elif column == "burst_time":
-
-            # divide variety of the column to 20 part and create range of numbers instead of a number
-            pieces = 20 if len(unique_columns) > 20 else 1
-            batches = len(unique_columns) // pieces
-            index_ranges = []
-
-            for c in range(pieces + 1):
-                low_range = batches * c
-                high_range = batches * (c + 1)
-                # mean over the ranges
-                result = df.where((low_range <= df[column]) & (df[column] < high_range)).mean(numeric_only=True)
-                data.append([
-                    result['waiting_time'],
-                    result['turnaround_time'],
-                    result['response_time']
-                ])
-
-                # create index ranges for creating index of dataframe
-                index_ranges.append(f"{low_range}-{high_range}")
-
-            # create dataframe
-            compress_df = pd.DataFrame(
-                data,
-                columns=['waiting_time', 'turnaround_time', 'response_time'],
-                index=index_ranges)
-
-        elif column == "arrival_time":
-            # divide variety of the column to 20 part and create range of numbers instead of a number
-            pieces = 20 if len(unique_columns) > 20 else 1
-            batches = len(unique_columns) // pieces
-            index_ranges = []
-
-            for c in range(pieces + 1):
-                low_range = batches * c
-                high_range = batches * (c + 1)
-                # mean over the ranges
-                result = df.where((low_range <= df[column]) & (df[column] < high_range)).mean(numeric_only=True)
-                data.append([
-                    result['waiting_time'],
-                    result['turnaround_time'],
-                    result['response_time']
-                ])
-
-                # create index ranges for creating index of dataframe
-                index_ranges.append(f"{low_range}-{high_range}")
-
-            # create dataframe
-            compress_df = pd.DataFrame(
-                data,
-                columns=['waiting_time', 'turnaround_time', 'response_time'],
-                index=index_ranges)
-
-        return compress_df
+        self.metrics = MetricsAccumulator()
+        self.cache = cache
+        self.cache_hit = False
+        self.trace = None
 
     def set_algorithm(self, algorithm: str) -> bool:
         """
@@ -149,58 +256,81 @@ class Simulator:
 
     @staticmethod
     def generate_processes_data(
-            path: str = 'data.csv', size: int = 1000, max_arrival_time: int = 100, max_priority=10, max_burst_time=40
+            path: str = 'data.csv', size: int = 1000, max_arrival_time: int = 100, max_priority=10, max_burst_time=40,
+            seed=None, chunk_size: int = 1000000, **distributions
     ) -> bool:
         """
-        Generate process with random numbers for arrival and burst time and priority. then save it to a csv file
+        Generate process with random numbers for arrival and burst time and priority. then save it to a csv file (or
+        parquet, arrow and .npy folder by suffix of path) chunk by chunk
         :param max_burst_time: maximum number for random number of burst time
         :param max_priority: maximum number for random number of priority
         :param max_arrival_time: maximum number for random number of arrival time
-        :param path: path to save csv file
+        :param path: path to save the file
         :param size: number of processes
+        :param seed: seed of numpy random generator. random by default
+        :param chunk_size: number of processes that are in memory at once
+        :param distributions: other arguments of WorkloadGenerator like burst='lognormal'. uniform by default
         :return: bool
         """
-        data = []
-        # save data as lists of lists then create dataframe. e.g [ [pid1, arrival1], [pid2, arrival2]]
-        for i in range(size):
-            data.append([
-                i + 1,  # PID
-                random.randint(0, max_arrival_time),  # arrival_time
-                random.randint(0, max_priority),  # priority
-                random.randint(0, max_burst_time),  # burst_time
-            ])
-
-        df = pd.DataFrame(data, columns=['pid', 'arrival_time', 'priority', 'burst_time'])
-        df.to_csv(path_or_buf=path, index=False)
+        generator = WorkloadGenerator(
+            seed, max_arrival_time=max_arrival_time, max_priority=max_priority, max_burst_time=max_burst_time,
+            **distributions
+        )
+        return generator.write(path, size, chunk_size)
 
-        return True
+    @staticmethod
+    def generate_processes(
+            size: int = 1000, max_arrival_time: int = 100, max_priority=10, max_burst_time=40, seed=None,
+            **distributions
+    ) -> ProcessTable:
+        """
+        Generate processes with random numbers for arrival and burst time and priority in memory, without a csv file.
+        the same seed gives the same processes
+        :param size: number of processes
+        :param max_arrival_time: maximum number for random number of arrival time
+        :param max_priority: maximum number for random number of priority
+        :param max_burst_time: maximum number for random number of burst time
+        :param seed: seed of numpy random generator. an int or a numpy SeedSequence
+        :param distributions: other arguments of WorkloadGenerator like burst='lognormal'. uniform by default
+        :return: ProcessTable
+        """
+        generator = WorkloadGenerator(
+            seed, max_arrival_time=max_arrival_time, max_priority=max_priority, max_burst_time=max_burst_time,
+            **distributions
+        )
+        return generator.generate(size)
 
-    def read_processes_data(self, path='data.csv', dataframe=None) -> bool:
+    def read_processes_data(self, path='data.csv', dataframe=None, validate: bool = True) -> bool:
         """
-        read data from csv file or pandas dataframe
+        read data from a csv, parquet, arrow (.arrow, .feather) or .npy folder file or pandas dataframe
         one of path or dataframe parms needed
-        :param path: string path of your csv file
+        columns are read with their types at once and validated at once, without creating an object for a row.
+        columns of arrow and .npy files are memory mapped, so they open without a copy and worker processes share them
+        :param path: string path of your file
         :param dataframe: you can pass dataframe object
+        :param validate: check values of processes. a big file which is saved from a valid table can skip it
         :return: a true boolean if everythings goes right
         """
+        started_at = time.perf_counter()
         if isinstance(dataframe, pd.DataFrame):
-            df = dataframe
-        elif path and path.split('.')[-1] == 'csv':
-            df = pd.read_csv(path)
+            columns = {column: dataframe[column].to_numpy() for column in dataframe.columns}
+        elif path:
+            # other columns of the file are skipped
+            columns = storage.read_columns(path, list(WORKLOAD_DTYPES), WORKLOAD_DTYPES)
         else:
-            raise Exception("Your file should be a csv format or pass dataframe object to function")
+            raise Exception("pass path of your file or dataframe object to function")
 
-        # clear last loaded processes
-        self.processes.clear()
+        missing_columns = [column for column in WORKLOAD_DTYPES if column not in columns]
+        if missing_columns:
+            raise Exception(f"Your data doesn't have {', '.join(missing_columns)} columns")
 
-        for i in range(0, df['pid'].count()):
-            process = Process(
-                pid=df['pid'][i],
-                arrival_time=df['arrival_time'][i],
-                priority=df['priority'][i],
-                burst_time=df['burst_time'][i]
-            )
-            self.processes.append(process)
+        # processes are kept as columns. It replaces last loaded processes
+        memory_mapped = dataframe is None and storage.is_memory_mapped(path)
+        processes = ProcessTable.from_columns(columns, source=path if memory_mapped else None)
+        if validate:
+            processes.validate()
+        self.processes = processes
+        self.load_time = time.perf_counter() - started_at
 
         return True
 
@@ -215,284 +345,616 @@ class Simulator:
             print(e)
             raise Exception("try again! you have to enter a valid algorithm")
 
-    def run(self):
+    def run(self, progress=None, trace: bool = False):
         """
         Simulate algorithm and save the result of it
+        :param progress: function which gets number of completed processes and number of all processes while the
+            algorithm runs, e.g. for a progress bar. the simulation is cancelled with an exception if it returns False
+        :param trace: record run segments of processes to trace attr. cached results have no trace, so they are
+            simulated again
         """
 
         if len(self.processes) == 0:
             raise Exception("you have to load processes")
 
-        # algorithm instance. need process list object
-        algorithm = self.algorithm_class(self.processes)
+        # algorithms run on columns of the table without creating process objects
+        if not isinstance(self.processes, ProcessTable):
+            self.processes = ProcessTable.from_processes(self.processes)
+
+        self.trace = Trace() if trace else None
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(self.processes, self.algorithm_class, self.parameters, self.cpus)
+            result = self.cache.get(cache_key) if not trace else None
+            self.cache_hit = result is not None
+            if self.cache_hit:
+                self.set_result(result)
+                return
+
+        # algorithm instance. need process table
+        algorithm = self.algorithm_class(self.processes, cpus=self.cpus, **self.parameters)
 
         start_time = time.time()
         # run algorithm
-        result = algorithm.run()
+        result = algorithm.run(progress, self.trace)
         end_time = time.time()
         self.run_time = end_time - start_time
 
         # set result of simulation
-        # this processes referred to executed processes in output of algorithm run
-        processes = result['executed_processes']
-        total_process = len(processes)
-        cpu_total_time = result['cpu_total_time']
-        cpu_run_time = cpu_total_time * get_cpu_time_unit()
-        throughput = total_process / cpu_total_time
-        cpu_utilization = (cpu_total_time - result['cpu_idle_time']) / cpu_total_time
-
-        average_waiting_time = sum(process.waiting_time for process in processes) / total_process
-        average_turnaround_time = sum(process.turnaround_time for process in processes) / total_process
-        average_response_time = sum(process.response_time for process in processes) / total_process
-
-        self.total_process = total_process
+        # executed processes are row indices of the table in output of algorithm run
+        processes = self.processes
+        self.total_process = len(result['executed_processes'])
+        self._set_cpu_result(result['cpu_total_time'], result['cpu_idle_time'], result['cpu_busy_time'],
+                             result['migrations'])
+
+        # each column is read once for mean, variance and quantiles
+        self.metrics = MetricsAccumulator()
+        self.metrics.add_arrays(processes.waiting_time, processes.turnaround_time, processes.response_time)
+        self.average_waiting_time = self.metrics.mean('waiting_time')
+        self.average_turnaround_time = self.metrics.mean('turnaround_time')
+        self.average_response_time = self.metrics.mean('response_time')
+
+        if cache_key is not None:
+            self.cache.put(cache_key, self.get_result())
+
+    def get_result(self) -> dict:
+        """
+        compact result of last run, e.g. for sending it from a worker process or caching it
+        :return: summary of simulation and result columns, no process objects
+        """
+        return {
+            "summary": self.json_export(),
+            "start_time": self.processes.start_time,
+            "end_time": self.processes.end_time,
+            "state": self.processes.state,
+            "metrics": self.metrics,
+        }
+
+    def set_result(self, result: dict):
+        """
+        set result of a run of the same processes, like it has run here
+        :param result: output of get_result function
+        """
+        processes = self.processes
+        processes.start_time = result['start_time']
+        processes.end_time = result['end_time']
+        processes.state = result['state']
+        processes.remaining_time = np.zeros(len(processes))
+        self.metrics = result['metrics']
+        for attribute, value in result['summary'].items():
+            # std and quantiles of summary come from metrics. processes are loaded here
+            if hasattr(self, attribute) and attribute != 'load_time':
+                setattr(self, attribute, value)
+
+    def _set_cpu_result(self, cpu_total_time, cpu_idle_time, cpu_busy_time: list, migrations: int):
+        """
+        set cpu metrics of simulation from cpu times of the algorithm
+        """
+        calibration = get_cpu_time_unit_calibration()
         self.cpu_total_time = cpu_total_time
-        self.cpu_run_time = cpu_run_time
-        self.throughput = throughput
-        self.cpu_utilization = cpu_utilization
-        self.average_waiting_time = average_waiting_time
-        self.average_turnaround_time = average_turnaround_time
-        self.average_response_time = average_response_time
-        # update processes
-        self.processes = processes
+        self.cpu_run_time = cpu_total_time * calibration['cpu_time_unit']
+        self.cpu_time_unit = calibration['cpu_time_unit']
+        self.cpu_time_unit_variance = calibration['cpu_time_unit_variance']
+        self.throughput = self.total_process / cpu_total_time
+        self.cpu_utilization = (self.cpus * cpu_total_time - cpu_idle_time) / (self.cpus * cpu_total_time)
+        self.cpu_utilizations = [busy_time / cpu_total_time for busy_time in cpu_busy_time]
+        self.migrations = migrations
+
+    @staticmethod
+    def read_processes_stream(path='data.csv', chunk_size: int = 100000):
+        """
+        read processes of a csv file chunk by chunk, so the file is never in memory at once
+        :param path: string path of your csv file. processes should be sorted by arrival time for run_stream
+        :param chunk_size: number of rows that are read at once
+        :return: generator of processes
+        """
+        if not (path and path.split('.')[-1] == 'csv'):
+            raise Exception("Your file should be a csv format")
+        chunks = pd.read_csv(
+            path, usecols=lambda column: column in WORKLOAD_DTYPES, dtype=WORKLOAD_DTYPES, chunksize=chunk_size)
+        for df in chunks:
+            missing_columns = [column for column in WORKLOAD_DTYPES if column not in df.columns]
+            if missing_columns:
+                raise Exception(f"Your data doesn't have {', '.join(missing_columns)} columns")
+            table = ProcessTable(
+                pid=df['pid'].to_numpy(),
+                arrival_time=df['arrival_time'].to_numpy(),
+                priority=df['priority'].to_numpy(),
+                burst_time=df['burst_time'].to_numpy()
+            )
+            table.validate()
+            for pid, arrival_time, priority, burst_time in zip(
+                    table.pid.tolist(), table.arrival_time.tolist(), table.priority.tolist(),
+                    table.burst_time.tolist()):
+                yield Process(pid, arrival_time, priority, burst_time)
+
+    def run_stream(self, processes=None, path=None, trace: bool = False):
+        """
+        Simulate algorithm online. processes are read while the algorithm runs and metrics are updated as each
+        process completes. completed processes are not kept, so memory depends on number of processes in the
+        system, not number of all processes
+        processes or path is needed. files of generate_processes_data (like data.csv) are not sorted by arrival time,
+        sort them first, e.g. with pandas
+        :param processes: iterable of processes sorted by arrival time, like a generator
+        :param path: string path of a csv file sorted by arrival time. it's read if processes isn't given
+        :param trace: record run segments of processes to trace attr. the trace grows with number of segments
+        :return: generator of completed processes in the order they complete
+        """
+        if processes is None:
+            if path is None:
+                raise Exception("you have to give processes or path of a csv file sorted by arrival time")
+            processes = self.read_processes_stream(path)
+        algorithm = self.algorithm_class(processes, cpus=self.cpus, **self.parameters)
 
-    def save_result_simulation(self):
+        self.total_process = 0
+        self.metrics = metrics = MetricsAccumulator()
+        self.trace = Trace() if trace else None
+        started_at = time.perf_counter()
+        for process in algorithm.stream(self.trace):
+            self.total_process += 1
+            metrics.add(process.waiting_time, process.turnaround_time, process.response_time)
+            self.cpu_total_time = process.end_time
+            self.average_waiting_time = metrics.mean('waiting_time')
+            self.average_turnaround_time = metrics.mean('turnaround_time')
+            self.average_response_time = metrics.mean('response_time')
+            yield process
+        # time of consumer of the generator is counted too
+        self.run_time = time.perf_counter() - started_at
+
+        if self.total_process:
+            self._set_cpu_result(algorithm.timeline, algorithm.cpu_idle_time, algorithm.cpu_busy_time,
+                                 algorithm.migrations)
+
+    def run_all(self, algorithm_names: list = None, workers: int = None, progress=None) -> dict:
+        """
+        run several algorithms on the loaded processes in parallel worker processes.
+        processes are parsed once and each worker gets columns of them once
+        :param algorithm_names: names of algorithms. all algorithms by default
+        :param workers: number of worker processes. number of cpus of this machine by default, 1 runs here without
+            worker processes
+        :param progress: function which gets number of completed processes of all algorithms and number of processes
+            times number of algorithms. running algorithms are stopped and the others are not run if it returns False,
+            then an exception is raised
+        :return: dict of algorithm name and its simulator with the result
+        """
+        if algorithm_names is None:
+            algorithm_names = self.algorithms_list
+        if len(self.processes) == 0:
+            raise Exception("you have to load processes")
+        if not isinstance(self.processes, ProcessTable):
+            self.processes = ProcessTable.from_processes(self.processes)
+        processes = self.processes
+
+        simulators = {}
+        for algorithm in algorithm_names:
+            simulator = Simulator(algorithm, self.cpus, cache=self.cache)
+            # columns of processes are shared, just results are for this simulator
+            simulator.processes = processes.copy()
+            simulator.load_time = self.load_time
+            simulators[algorithm] = simulator
+
+        # cached results are set here, just other algorithms are sent to workers
+        pending = []
+        for algorithm, simulator in simulators.items():
+            if self.cache is not None:
+                result = self.cache.get(
+                    self.cache.key(processes, simulator.algorithm_class, simulator.parameters, self.cpus))
+                simulator.cache_hit = result is not None
+                if simulator.cache_hit:
+                    simulator.set_result(result)
+                    continue
+            pending.append(algorithm)
+
+        size = len(processes)
+        total = len(simulators) * size
+        # polling interval of progress of workers in seconds
+        poll_delay = 0.1
+
+        def finish(algorithm, output):
+            simulator = simulators[algorithm]
+            simulator.set_result(output)
+            if self.cache is not None:
+                self.cache.put(
+                    self.cache.key(processes, simulator.algorithm_class, simulator.parameters, self.cpus), output)
+
+        def report(running: int = 0):
+            completed = (len(simulators) - len(pending)) * size + running
+            if progress is not None and progress(completed, total) is False:
+                raise Exception("simulation is cancelled")
+
+        report()
+        if workers == 1 or not pending:
+            for algorithm in list(pending):
+                output = _run_algorithm(
+                    algorithm, self.cpus, processes, None if progress is None else lambda completed, _: report(completed)
+                )
+                pending.remove(algorithm)
+                finish(algorithm, output)
+            return simulators
+
+        context = multiprocessing.get_context()
+        cancelled = context.Event()
+        slots = {algorithm: slot for slot, algorithm in enumerate(pending)}
+        completed = context.Array('q', len(pending))
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=_init_worker,
+            initargs=(processes, get_cpu_time_unit_calibration(), cancelled, completed)
+        )
+        futures = {
+            executor.submit(_run_algorithm, algorithm, self.cpus, None, None, slot): algorithm
+            for algorithm, slot in slots.items()
+        }
+        try:
+            running = set(futures)
+            while running:
+                done, running = wait(running, timeout=poll_delay, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(futures[future])
+                    finish(futures[future], future.result())
+                counts = completed[:]
+                report(sum(counts[slots[algorithm]] for algorithm in pending))
+        except BaseException:
+            # running algorithms see the flag at their next progress step, the others are not run
+            cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+        return simulators
+
+    def sweep(self, grid: dict, workers: int = None):
+        """
+        run the algorithm over a grid of parameters in parallel worker processes. processes are parsed and sorted by
+        arrival time once, then each worker gets them once and all grid points reuse them
+        e.g. sweep({"quantum_number": [1, 2, 4, 8], "cpus": [1, 2]}) runs RR 8 times
+        :param grid: dict of parameter name and list of its values. cpus is number of cpus, others are parameters of
+            algorithm class
+        :param workers: number of worker processes. number of cpus of this machine by default, 1 runs here without
+            worker processes
+        :return: generator of result rows in the order that grid points are finished. each row is a dict of algorithm
+            name, parameters of the point and summary of simulation
+        """
+        if len(self.processes) == 0:
+            raise Exception("you have to load processes")
+        if not isinstance(self.processes, ProcessTable):
+            self.processes = ProcessTable.from_processes(self.processes)
+        processes = self.processes.sorted_by_arrival()
+
+        names = list(grid)
+        points = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+        if workers == 1:
+            for point in points:
+                yield _run_grid_point(self.algorithm, point, processes)
+            return
+
+        with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker,
+                initargs=(processes, get_cpu_time_unit_calibration())
+        ) as executor:
+            futures = [executor.submit(_run_grid_point, self.algorithm, point) for point in points]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def replicate(
+            self, replications: int = 30, seed: int = 0, workload: dict = None, algorithm_names: list = None,
+            workers: int = None
+    ) -> pd.DataFrame:
+        """
+        run algorithms on several random workloads and summarize metrics of them with 95% confidence intervals.
+        workloads are generated in worker processes and workers send back just metrics of each replication
+        :param replications: number of random workloads
+        :param seed: seed of all replications. each replication gets an independent seed from it
+        :param workload: arguments of generate_processes function like size. its defaults by default
+        :param algorithm_names: names of algorithms. all algorithms by default
+        :param workers: number of worker processes. number of cpus of this machine by default, 1 runs here without
+            worker processes
+        :return: dataframe with algorithm, metric, mean, std, ci_low, ci_high and replications columns. std, ci_low
+            and ci_high are nan for one replication
+        """
+        if replications < 1:
+            raise Exception("number of replications should be at least 1")
+        if algorithm_names is None:
+            algorithm_names = self.algorithms_list
+        workload = workload or {}
+        seeds = np.random.SeedSequence(seed).spawn(replications)
+
+        arguments = ([algorithm_names] * replications, seeds, [self.cpus] * replications, [workload] * replications)
+        if workers == 1:
+            outputs = list(map(_run_replication, *arguments))
+        else:
+            with ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_worker, initargs=(None, get_cpu_time_unit_calibration())
+            ) as executor:
+                # small replications are sent to workers in batches
+                outputs = list(executor.map(_run_replication, *arguments, chunksize=max(1, replications // 64)))
+
+        # axes are replication, algorithm and metric
+        metrics = np.asarray(outputs, dtype=np.float64)
+        mean = metrics.mean(axis=0)
+        if replications > 1:
+            std = metrics.std(axis=0, ddof=1)
+            half_width = _t_quantile(replications - 1) * std / np.sqrt(replications)
+        else:
+            # one replication has no spread, so its confidence interval is unknown
+            std = half_width = np.full_like(mean, np.nan)
+
+        rows = []
+        for i, algorithm in enumerate(algorithm_names):
+            for j, metric in enumerate(REPLICATION_METRICS):
+                rows.append([
+                    algorithm, metric, mean[i, j], std[i, j], mean[i, j] - half_width[i, j],
+                    mean[i, j] + half_width[i, j], replications
+                ])
+        return pd.DataFrame(rows, columns=['algorithm', 'metric', 'mean', 'std', 'ci_low', 'ci_high', 'replications'])
+
+    def save_result_simulation(self, file_format: str = 'csv'):
         """
         Save result of simulation to results/algorithmname.csv
-        :param max_arrival_time: maximum number for random number of arrival time
-        :param path: path to save csv file
-        :param size: number of processes
+        other formats (parquet, arrow, npy) save columns of processes to results/algorithmname.<format> and summary of
+        simulation to results/algorithmname.json. saved results of the algorithm in other formats are removed
+        a recorded trace is saved to results/algorithmname_trace.<format> too, a saved trace of an older run is removed
+        :param file_format: csv, parquet, arrow or npy
         :return: bool
         """
+        if file_format not in storage.SUFFIXES:
+            raise Exception(f"file format should be one of {', '.join(storage.SUFFIXES)}")
         if not self.cpu_total_time > 0:
             print("you have to run an algorithm then save it")
             return
 
-        self.processes.sort(key=lambda p: p.pid)
-        data = []
-        columns = [
-            # process information
-            'pid', 'arrival_time', 'priority', 'burst_time', 'waiting_time', 'turnaround_time', 'response_time',
-            'start_time', 'end_time',
-            # simulation information
-            'total_process', 'run_time', 'cpu_total_time', 'cpu_run_time', 'cpu_utilization', 'throughput',
-            'average_waiting_time', 'average_turnaround_time', 'average_response_time'
-        ]
-        # save data as lists of lists then create dataframe. e.g [ [pid1, arrival1], [pid2, arrival2]]
-        for process in self.processes:
-            data.append([
-                process.pid,
-                process.arrival_time,
-                process.priority,
-                process.burst_time,
-                process.waiting_time,
-                process.turnaround_time,
-                process.response_time,
-                process.start_time,
-                process.end_time,
-            ])
-
-        # insert simulation information to just first row
-        data[0].extend([
-            self.total_process,
-            self.run_time,
-            self.cpu_total_time,
-            self.cpu_run_time,
-            self.cpu_utilization,
-            self.throughput,
-            self.average_waiting_time,
-            self.average_turnaround_time,
-            self.average_response_time
-        ])
-        df = pd.DataFrame(data, columns=columns)
+        processes = self.processes
+        # sort by pid
+        order = np.argsort(processes.pid, kind='stable')
+        # process information
+        columns = {
+            'pid': processes.pid[order],
+            'arrival_time': processes.arrival_time[order],
+            'priority': processes.priority[order],
+            'burst_time': processes.burst_time[order],
+            'waiting_time': processes.waiting_time[order],
+            'turnaround_time': processes.turnaround_time[order],
+            'response_time': processes.response_time[order],
+            'start_time': processes.start_time[order],
+            'end_time': processes.end_time[order],
+        }
 
         # handle path in linux and windows
         folder_path = Path("results/")
+        # results of other formats are removed, so readers don't find an older run
+        for other_format, suffix in storage.SUFFIXES.items():
+            if other_format != file_format:
+                storage.remove_columns(folder_path / f"{self.algorithm}{suffix}")
+        if file_format == 'csv':
+            storage.remove_columns(folder_path / f"{self.algorithm}.json")
+        # a trace of an older run is removed too, even if this run has no trace
+        for suffix in storage.SUFFIXES.values():
+            storage.remove_columns(folder_path / f"{self.algorithm}_trace{suffix}")
+        if self.trace is not None:
+            self.trace.save(folder_path / f"{self.algorithm}_trace{storage.SUFFIXES[file_format]}")
+        if file_format != 'csv':
+            storage.write_columns(folder_path / f"{self.algorithm}{storage.SUFFIXES[file_format]}", columns)
+            with open(folder_path / f"{self.algorithm}.json", 'w') as file:
+                json.dump(self.json_export(), file, indent=4)
+            return True
+
+        df = pd.DataFrame(columns)
+
+        # insert simulation information to just first row
+        simulation_information = {
+            'total_process': self.total_process,
+            'run_time': self.run_time,
+            'cpu_total_time': self.cpu_total_time,
+            'cpu_run_time': self.cpu_run_time,
+            'cpu_utilization': self.cpu_utilization,
+            'throughput': self.throughput,
+            'cpus': self.cpus,
+            'migrations': self.migrations,
+            'average_waiting_time': self.average_waiting_time,
+            'average_turnaround_time': self.average_turnaround_time,
+            'average_response_time': self.average_response_time
+        }
+        for column, value in simulation_information.items():
+            values = np.full(len(df), np.nan)
+            values[0] = value
+            df[column] = values
+
         df.to_csv(path_or_buf=folder_path / f"{self.algorithm}.csv", index=False)
 
         return True
 
-    def analyze_algorithms(self):
+    def store_result(self, store: ResultStore = None, seed=None) -> str:
+        """
+        save result of simulation to the result store. runs of other workloads, parameters or seeds are kept
+        :param store: result store. results/store by default
+        :param seed: seed of the workload if it's generated
+        :return: run id
+        """
+        if not self.cpu_total_time > 0:
+            raise Exception("you have to run an algorithm then store it")
+        if store is None:
+            store = ResultStore()
+        return store.save(self, seed)
+
+    def compare_algorithms(self, simulators: dict = None, store: ResultStore = None, folder='results/') -> pd.DataFrame:
+        """
+        average times of algorithms, saved to results/results.csv too
+        :param simulators: output of run_all. results of last runs are read from results folder by default
+        :param store: compare the newest runs of the store instead, for loaded processes if there are loaded ones.
+            runs of the same algorithm with other parameters or cpus are compared too
+        :param folder: folder of results
+        :return: dataframe of name and average waiting, turnaround and response time of each algorithm
+        """
 
         # handle path in linux and windows
-        folder_path = Path("results/")
+        folder_path = Path(folder)
         columns = [
             'average_waiting_time', 'average_turnaround_time', 'average_response_time'
         ]
         algorithms_data = []
         exists_algorithms = []
-        for algo in self.algorithms_list:
-            try:
-                df = pd.read_csv(folder_path / f"{algo}.csv", usecols=columns)
+        if simulators is not None:
+            for algo, simulator in simulators.items():
                 algorithms_data.append([
                     algo,  # algorithm name
-                    df['average_waiting_time'][0],
-                    df['average_turnaround_time'][0],
-                    df['average_response_time'][0],
+                    simulator.average_waiting_time,
+                    simulator.average_turnaround_time,
+                    simulator.average_response_time,
+                ])
+                exists_algorithms.append(algo)
+        elif store is not None:
+            workload_hash = self.processes.hash() if isinstance(self.processes, ProcessTable) else None
+            for _, run in store.latest_runs(workload_hash).iterrows():
+                name = run['algorithm']
+                if run['parameters'] != '{}':
+                    name += f" {run['parameters']}"
+                if run['cpus'] > 1:
+                    name += f" {run['cpus']} cpus"
+                algorithms_data.append([
+                    name,
+                    run['average_waiting_time'],
+                    run['average_turnaround_time'],
+                    run['average_response_time'],
+                ])
+                exists_algorithms.append(name)
+        else:
+            for algo in self.algorithms_list:
+                try:
+                    df = pd.read_csv(folder_path / f"{algo}.csv", usecols=columns, nrows=1)
+                    summary = {column: df[column][0] for column in columns}
+                except FileNotFoundError:
+                    # results of other formats have summary in a json file
+                    try:
+                        with open(folder_path / f"{algo}.json") as file:
+                            summary = json.load(file)
+                    except FileNotFoundError:
+                        continue
+                algorithms_data.append([
+                    algo,  # algorithm name
+                    summary['average_waiting_time'],
+                    summary['average_turnaround_time'],
+                    summary['average_response_time'],
                 ])
                 exists_algorithms.append(algo)
-            except FileNotFoundError:
-                pass
 
-        if algorithms_data is None:
+        if not algorithms_data:
             raise Exception("You have to run one algorithm at least")
 
         columns.insert(0, 'name')
         algorithms_df = pd.DataFrame(algorithms_data, columns=columns, index=exists_algorithms)
         algorithms_df.to_csv(folder_path / "results.csv", index=False)
+        return algorithms_df
+
+    def analyze_algorithms(self, simulators: dict = None, store: ResultStore = None, show: bool = True):
+        """
+        compare algorithms and plot them
+        :param simulators: output of run_all. results of last runs are read from results folder by default
+        :param store: compare the newest runs of the store instead, for loaded processes if there are loaded ones.
+            runs of the same algorithm with other parameters or cpus are compared too
+        :param show: show the chart in a window. otherwise it's just saved without a window and closed
+        """
+        algorithms_df = self.compare_algorithms(simulators, store)
+        if not show:
+            charts.render_comparison(algorithms_df)
+            return
 
-        # create subpot
-        subplot = algorithms_df.plot(kind='bar')
-        subplot.set_xlabel('algorithm name')
-        subplot.set_ylabel('Time')
-        subplot.set_title(f"analyze algorithms")
-        subplot.legend()
+        # pyplot needs a window backend, so it's imported just for windows
+        from matplotlib import pyplot
 
-        subplot.figure.set_size_inches(20.5, 15.5)
+        figure = charts.comparison_figure(algorithms_df, new_figure=pyplot.figure)
         # Set the figure title
-        subplot.figure.canvas.manager.set_window_title(f"analyze {self.total_process} algorithms")
-        subplot.figure.show()
-        subplot.figure.savefig(folder_path / "result")
-
-    def plot_algorithm_result(self):
+        figure.canvas.manager.set_window_title(f"analyze {self.total_process} algorithms")
+        figure.show()
+        figure.savefig(Path("results/") / "result")
 
-        # handle path in linux and windows
-        folder_path = Path("results/")
-        try:
-            df = pd.read_csv(folder_path / f"{self.algorithm}.csv")
-        except FileNotFoundError:
-            raise Exception("You should have run algorithm first")
+    def plot_algorithm_result(self, bins: int = 20, show: bool = True):
+        """
+        plot mean waiting, turnaround and response time by priority, burst time and arrival time of processes of
+        saved result of the algorithm
+        :param bins: maximum number of bars of each chart
+        :param show: show charts in windows. otherwise they are just saved without windows and closed
+        """
+        columns, summary = charts.read_result(self.algorithm)
 
         # set data
-        try:
-            self.run_time = df['run_time'][0]
-            self.cpu_total_time = df['cpu_total_time'][0]
-            self.cpu_run_time = df['cpu_run_time'][0]
-            self.cpu_utilization = df['cpu_utilization'][0]
-            self.throughput = df['throughput'][0]
-            self.average_waiting_time = df['average_waiting_time'][0]
-            self.average_turnaround_time = df['average_turnaround_time'][0]
-            self.average_response_time = df['average_response_time'][0]
-        except:
-            pass
-
-        df = df[['burst_time', 'arrival_time', 'priority', 'waiting_time', 'turnaround_time', 'response_time']]
-
-        # get compressed dataframe for showing in chart
-        # subplot settings based on priority
-        priority_df = self._compress_df_rows(df, 'priority')
-        priority_subplot = priority_df.plot(
-            kind='bar',
-            xlabel="Priority",
-            ylabel="Time",
-            title=self.algorithm
-        )
-        priority_subplot.figure.set_size_inches(30, 15)
-
-        # subplot settings based on burst time
-        burst_df = self._compress_df_rows(df, 'burst_time')
-        burst_subplot = burst_df.plot(
-            kind='bar',
-            xlabel="Burst time",
-            ylabel="Time",
-            title=self.algorithm
-        )
-        burst_subplot.figure.set_size_inches(30, 15)
-
-        # subplot settings based on arrival time
-        arrival_df = self._compress_df_rows(df, 'arrival_time')
-        arrival_subplot = arrival_df.plot(
-            kind='bar',
-            xlabel="Arrival time",
-            ylabel="Time",
-            title=self.algorithm
-        )
-        arrival_subplot.figure.set_size_inches(30, 15)
-
-        fig_text = (
-                'Simulation time: %.10f s\n'
-                'CPU total time: %.0f s\n'
-                'CPU run time: %.0f s\n'
-                'CPU utilization: %.6f%%\n'
-                'Throughput: %.6f\n'
-                'Average waiting time: %.2f\n'
-                'Average turnaround time: %.2f\n'
-                'Average response time: %.2f' % (
-                    self.run_time,
-                    self.cpu_total_time,
-                    self.cpu_run_time,
-                    (self.cpu_utilization * 100),
-                    self.throughput,
-                    self.average_waiting_time,
-                    self.average_turnaround_time,
-                    self.average_response_time
-                )
-        )
-
-        # add text to subplots
-        priority_subplot.figure.text(
-            0.5, 0.25,
-            fig_text,
-            bbox={'facecolor': 'white', 'alpha': 0.5, 'pad': 50}
-        )
-        burst_subplot.figure.text(
-            0.5, 0.25,
-            fig_text,
-            bbox={'facecolor': 'white', 'alpha': 0.5, 'pad': 50}
-        )
-        arrival_subplot.figure.text(
-            0.5, 0.25,
-            fig_text,
-            bbox={'facecolor': 'white', 'alpha': 0.5, 'pad': 50}
-        )
-
-        # show and save
-        priority_subplot.figure.show()
-        burst_subplot.figure.show()
-        arrival_subplot.figure.show()
+        for attribute, value in summary.items():
+            if attribute in charts.SUMMARY_COLUMNS:
+                setattr(self, attribute, value)
 
         # handle path in linux and windows
         fig_folder_path = Path("results/charts/")
-        priority_subplot.figure.savefig(fig_folder_path / f'priority_{self.algorithm}')
-        burst_subplot.figure.savefig(fig_folder_path / f'burst_{self.algorithm}')
-        arrival_subplot.figure.savefig(fig_folder_path / f'arrival_{self.algorithm}')
+        if not show:
+            charts.save_algorithm_charts(self.algorithm, columns, summary, fig_folder_path, bins)
+            return
+
+        # pyplot needs a window backend, so it's imported just for windows
+        from matplotlib import pyplot
+
+        figures = charts.algorithm_figures(self.algorithm, columns, summary, bins, new_figure=pyplot.figure)
+        # show and save
+        for name, figure in figures.items():
+            figure.show()
+            figure.savefig(fig_folder_path / f'{name}_{self.algorithm}')
 
     def json_export(self):
         return {
             "total_process": self.total_process,
+            "load_time": self.load_time,
             "run_time": self.run_time,
             "cpu_total_time": self.cpu_total_time,
             "cpu_run_time": self.cpu_run_time,
+            "cpu_time_unit": self.cpu_time_unit,
+            "cpu_time_unit_variance": self.cpu_time_unit_variance,
             "throughput": self.throughput,
             "cpu_utilization": self.cpu_utilization,
+            "cpus": self.cpus,
+            "parameters": self.parameters,
+            "cpu_utilizations": self.cpu_utilizations,
+            "migrations": self.migrations,
             "average_waiting_time": self.average_waiting_time,
             "average_turnaround_time": self.average_turnaround_time,
-            "average_response_time": self.average_response_time
+            "average_response_time": self.average_response_time,
+            **self.metrics.json_export()
         }
 
     def __str__(self):
         return (
             'Total processes: %.0f \n'
+            'Load time: %.10f s\n'
             'Simulation time: %.10f s\n'
             'CPU total time: %.0f \n'
             'CPU run time: %.0f s\n'
+            'CPUs: %d\n'
             'CPU utilization: %.6f%%\n'
+            'Migrations: %d\n'
             'Throughput: %.6f\n'
             'Average waiting time: %.2f\n'
             'Average turnaround time: %.2f\n'
-            'Average response time: %.2f' % (
+            'Average response time: %.2f\n'
+            'P95 / P99 waiting time: %.2f / %.2f\n'
+            'P95 / P99 response time: %.2f / %.2f' % (
                 self.total_process,
+                self.load_time,
                 self.run_time,
                 self.cpu_total_time,
                 self.cpu_run_time,
+                self.cpus,
                 (self.cpu_utilization * 100),
+                self.migrations,
                 self.throughput,
                 self.average_waiting_time,
                 self.average_turnaround_time,
-                self.average_response_time
+                self.average_response_time,
+                self.metrics.quantile('waiting_time', 0.95),
+                self.metrics.quantile('waiting_time', 0.99),
+                self.metrics.quantile('response_time', 0.95),
+                self.metrics.quantile('response_time', 0.99)
             )
         )
 
 
 if __name__ == '__main__':
+    # graphic module imports this module, so it's imported here
+    from graphics import graphic as simulation_graphic
+
     simulation_graphic.run()
@@ -0,0 +1,165 @@
+"""
+columnar files of processes and results. a file is read or written as a dict of numpy columns.
+formats are found by suffix of the path:
+    .csv: text, parsed with pandas
+    .parquet: compressed columns, needs pyarrow
+    .arrow or .feather: arrow ipc file, needs pyarrow. it's memory mapped, so reading doesn't copy columns
+    .npy: a folder with a .npy file for each column. it's memory mapped too and needs just numpy
+memory mapped columns are read only and pages of the file are shared by all processes that open it
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.npy': 'npy',
+}
+# suffix of files of each format
+SUFFIXES = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+    'npy': '.npy',
+}
+
+
+def _pyarrow():
+    """
+    pyarrow is an optional dependency, just parquet and arrow files need it
+    """
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError:
+        raise Exception("parquet and arrow files need pyarrow. install it with: pip install pyarrow")
+    return pyarrow
+
+
+def get_format(path) -> str:
+    """
+    :param path: path of a file
+    :return: csv, parquet, arrow or npy
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMATS:
+        raise Exception(f"Your file should be one of {', '.join(FORMATS)} formats")
+    return FORMATS[suffix]
+
+
+def is_memory_mapped(path) -> bool:
+    """
+    columns of the file are memory mapped when they are read
+    """
+    return get_format(path) in ('arrow', 'npy')
+
+
+def read_columns(path, columns: list = None, dtypes: dict = None) -> dict:
+    """
+    read columns of a file
+    :param path: path of the file
+    :param columns: names of columns. all columns by default
+    :param dtypes: types of columns for csv files
+    :return: dict of column name and numpy array. names which are not in the file are not in the dict
+    """
+    file_format = get_format(path)
+    if file_format == 'csv':
+        df = pd.read_csv(path, usecols=(lambda column: column in columns) if columns else None, dtype=dtypes)
+        return {column: df[column].to_numpy() for column in df.columns}
+
+    if file_format == 'npy':
+        folder = Path(path)
+        names = columns if columns else [file.stem for file in sorted(folder.glob('*.npy'))]
+        return {
+            name: np.load(folder / f"{name}.npy", mmap_mode='r')
+            for name in names if (folder / f"{name}.npy").exists()
+        }
+
+    pyarrow = _pyarrow()
+    if file_format == 'arrow':
+        table = pyarrow.feather.read_table(str(path), memory_map=True)
+    else:
+        table = pyarrow.parquet.read_table(str(path))
+    names = columns if columns else table.column_names
+    result = {}
+    for name in names:
+        if name in table.column_names:
+            column = table.column(name)
+            # one chunk without nulls is a view of the file, otherwise it's copied
+            if column.num_chunks == 1:
+                result[name] = column.chunk(0).to_numpy(zero_copy_only=False)
+            else:
+                result[name] = column.to_numpy()
+    return result
+
+
+def write_columns(path, columns: dict) -> bool:
+    """
+    write columns to a file. all columns should have the same length
+    :param path: path of the file
+    :param columns: dict of column name and array
+    :return: bool
+    """
+    file_format = get_format(path)
+    if file_format == 'csv':
+        pd.DataFrame(columns).to_csv(path, index=False)
+        return True
+
+    if file_format == 'npy':
+        folder = Path(path)
+        folder.mkdir(parents=True, exist_ok=True)
+        for name, values in columns.items():
+            np.save(folder / f"{name}.npy", np.asarray(values))
+        return True
+
+    pyarrow = _pyarrow()
+    table = pyarrow.table({name: np.asarray(values) for name, values in columns.items()})
+    if file_format == 'arrow':
+        # uncompressed, so it can be memory mapped
+        pyarrow.feather.write_feather(table, str(path), compression='uncompressed')
+    else:
+        pyarrow.parquet.write_table(table, str(path))
+    return True
+
+
+def remove_columns(path) -> bool:
+    """
+    remove a file of columns, e.g. a result which is saved in another format now
+    :param path: path of the file. a .npy folder is removed with its columns
+    :return: True if there was a file
+    """
+    path = Path(path)
+    if path.is_dir():
+        for file in path.glob('*.npy'):
+            file.unlink()
+        try:
+            path.rmdir()
+        except OSError:
+            # the folder has other files too
+            pass
+        return True
+    if path.exists():
+        path.unlink()
+        return True
+    return False
+
+
+def open_columns(path, columns: dict, size: int) -> dict:
+    """
+    create a .npy folder with empty columns to be filled chunk by chunk, so big columns are never in memory
+    :param path: path of the folder
+    :param columns: dict of column name and its type
+    :param size: length of columns
+    :return: dict of column name and writable memory mapped array
+    """
+    folder = Path(path)
+    folder.mkdir(parents=True, exist_ok=True)
+    return {
+        name: np.lib.format.open_memmap(folder / f"{name}.npy", mode='w+', dtype=dtype, shape=(size,))
+        for name, dtype in columns.items()
+    }
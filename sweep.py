@@ -0,0 +1,51 @@
+"""
+run an algorithm over a grid of parameters and save results of all grid points to one csv file
+e.g. python sweep.py RR --quantum-number 1 2 4 8 --cpus 1 2
+"""
+import argparse
+import csv
+
+from simulator import Simulator
+from pathlib import Path
+
+
+def parse_arguments(args=None):
+    parser = argparse.ArgumentParser(description="sweep parameters of a scheduling algorithm")
+    parser.add_argument('algorithm', help="algorithm name like RR")
+    parser.add_argument('--data', default='data.csv', help="csv file of processes")
+    parser.add_argument('--cpus', type=int, nargs='+', default=[1], help="numbers of cpus")
+    parser.add_argument('--quantum-number', type=float, nargs='+', help="quantum numbers of RR")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of worker processes. number of cpus of this machine by default")
+    parser.add_argument('--output', default=None, help="csv file of results. results/sweep_<algorithm>.csv by default")
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    arguments = parse_arguments(args)
+
+    grid = {"cpus": arguments.cpus}
+    if arguments.quantum_number is not None:
+        grid["quantum_number"] = arguments.quantum_number
+
+    simulator = Simulator(arguments.algorithm)
+    simulator.read_processes_data(arguments.data)
+
+    output = Path(arguments.output or Path("results/") / f"sweep_{arguments.algorithm}.csv")
+    with open(output, 'w', newline='') as file:
+        writer = None
+        # rows are written as soon as each grid point is finished
+        for row in simulator.sweep(grid, arguments.workers):
+            if writer is None:
+                writer = csv.DictWriter(file, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+            file.flush()
+            print(', '.join(f"{key}: {row[key]}" for key in grid), '| average waiting time: %.2f' % (
+                row['average_waiting_time']))
+
+    return True
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""
+random workloads generated with numpy. columns are generated at once instead of a random call for each process, and
+big workloads are generated and written to disk in chunks
+"""
+import numpy as np
+import pandas as pd
+
+import storage
+from process import ProcessTable
+
+
+class WorkloadGenerator(object):
+    """
+    generator of random processes with a seed. arrival times, burst times and priorities have their own random
+    streams, so the same seed gives the same processes however they are chunked (float poisson arrivals can differ
+    in the last digit, because the sum of inter-arrival times is rounded per chunk)
+    """
+    ARRIVALS = ('uniform', 'poisson')
+    BURSTS = ('uniform', 'exponential', 'lognormal', 'bimodal')
+    PRIORITIES = ('uniform', 'zipf')
+
+    def __init__(
+            self, seed=None, arrival: str = 'uniform', max_arrival_time: float = 100, arrival_rate: float = 1.0,
+            burst: str = 'uniform', max_burst_time: float = 40, mean_burst_time: float = 20, burst_sigma: float = 0.5,
+            long_burst_time: float = 200, long_burst_fraction: float = 0.2, priority: str = 'uniform',
+            max_priority: int = 10, zipf_exponent: float = 1.5, integer_times: bool = True
+    ):
+        """
+        :param seed: seed of numpy random generator. an int or a numpy SeedSequence
+        :param arrival: uniform between 0 and max_arrival_time, or poisson process with arrival_rate (exponential
+            inter-arrival times)
+        :param max_arrival_time: maximum number of uniform arrival times
+        :param arrival_rate: mean number of arrivals in a unit of time for poisson arrivals
+        :param burst: uniform between 0 and max_burst_time, exponential or lognormal with mean_burst_time, or bimodal
+            that is lognormal around mean_burst_time for short processes and around long_burst_time for long ones
+        :param max_burst_time: maximum number of uniform burst times
+        :param mean_burst_time: mean of exponential and lognormal burst times, mean of short processes of bimodal
+        :param burst_sigma: standard deviation of log of lognormal and bimodal burst times
+        :param long_burst_time: mean of long processes of bimodal burst times
+        :param long_burst_fraction: fraction of long processes of bimodal burst times
+        :param priority: uniform between 0 and max_priority, or zipf that priority k has a weight of 1 / (k + 1) ** s
+            so low numbers are much more common
+        :param max_priority: maximum number of priorities
+        :param zipf_exponent: s of zipf priorities
+        :param integer_times: round times to integers like csv files of generate_processes_data. burst times of
+            exponential, lognormal and bimodal are rounded up, so they are at least 1
+        """
+        if arrival not in self.ARRIVALS:
+            raise Exception(f"arrival should be one of {', '.join(self.ARRIVALS)}")
+        if burst not in self.BURSTS:
+            raise Exception(f"burst should be one of {', '.join(self.BURSTS)}")
+        if priority not in self.PRIORITIES:
+            raise Exception(f"priority should be one of {', '.join(self.PRIORITIES)}")
+        if arrival_rate <= 0 or mean_burst_time <= 0 or long_burst_time <= 0:
+            raise Exception("rates and means of workload should be positive")
+        if not 0 <= long_burst_fraction <= 1:
+            raise Exception("long_burst_fraction should be between 0 and 1")
+
+        self.arrival = arrival
+        self.max_arrival_time = max_arrival_time
+        self.arrival_rate = arrival_rate
+        self.burst = burst
+        self.max_burst_time = max_burst_time
+        self.mean_burst_time = mean_burst_time
+        self.burst_sigma = burst_sigma
+        self.long_burst_time = long_burst_time
+        self.long_burst_fraction = long_burst_fraction
+        self.priority = priority
+        self.max_priority = max_priority
+        self.zipf_exponent = zipf_exponent
+        self.integer_times = integer_times
+
+        # a stream for each random column
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        arrival_seed, burst_seed, mode_seed, priority_seed = seed.spawn(4)
+        self._arrival_generator = np.random.default_rng(arrival_seed)
+        self._burst_generator = np.random.default_rng(burst_seed)
+        self._mode_generator = np.random.default_rng(mode_seed)
+        self._priority_generator = np.random.default_rng(priority_seed)
+        # poisson arrivals of the next chunk continue from the last arrival
+        self._last_arrival_time = 0.0
+        self._next_pid = 1
+        # weights of zipf priorities are computed once
+        self._priority_weights = None
+        if priority == 'zipf':
+            weights = 1 / np.arange(1, max_priority + 2) ** zipf_exponent
+            self._priority_weights = weights / weights.sum()
+
+    def _arrival_times(self, size: int) -> np.ndarray:
+        if self.arrival == 'uniform':
+            if self.integer_times:
+                return self._arrival_generator.integers(0, self.max_arrival_time, size, endpoint=True)
+            return self._arrival_generator.uniform(0, self.max_arrival_time, size)
+
+        arrival_time = self._last_arrival_time + np.cumsum(
+            self._arrival_generator.exponential(1 / self.arrival_rate, size))
+        if size:
+            self._last_arrival_time = arrival_time[-1]
+        return np.floor(arrival_time) if self.integer_times else arrival_time
+
+    def _lognormal(self, mean, size: int) -> np.ndarray:
+        # mean of lognormal is exp(mu + sigma ** 2 / 2)
+        mu = np.log(mean) - self.burst_sigma ** 2 / 2
+        return np.exp(mu + self.burst_sigma * self._burst_generator.standard_normal(size))
+
+    def _burst_times(self, size: int) -> np.ndarray:
+        if self.burst == 'uniform':
+            if self.integer_times:
+                return self._burst_generator.integers(0, self.max_burst_time, size, endpoint=True)
+            return self._burst_generator.uniform(0, self.max_burst_time, size)
+
+        if self.burst == 'exponential':
+            burst_time = self._burst_generator.exponential(self.mean_burst_time, size)
+        elif self.burst == 'lognormal':
+            burst_time = self._lognormal(self.mean_burst_time, size)
+        else:
+            long = self._mode_generator.random(size) < self.long_burst_fraction
+            burst_time = self._lognormal(np.where(long, self.long_burst_time, self.mean_burst_time), size)
+        return np.maximum(np.ceil(burst_time), 1) if self.integer_times else burst_time
+
+    def _priorities(self, size: int) -> np.ndarray:
+        if self.priority == 'uniform':
+            return self._priority_generator.integers(0, self.max_priority, size, endpoint=True)
+        return self._priority_generator.choice(self.max_priority + 1, size, p=self._priority_weights)
+
+    def generate(self, size: int) -> ProcessTable:
+        """
+        generate next processes. pids and poisson arrivals continue from the last generated processes
+        :param size: number of processes
+        :return: ProcessTable
+        """
+        pid = np.arange(self._next_pid, self._next_pid + size)
+        self._next_pid += size
+        return ProcessTable(
+            pid=pid,
+            arrival_time=self._arrival_times(size),
+            priority=self._priorities(size),
+            burst_time=self._burst_times(size),
+        )
+
+    def chunks(self, size: int, chunk_size: int = 1000000):
+        """
+        generate processes chunk by chunk, so just one chunk is in memory
+        :param size: number of all processes
+        :param chunk_size: maximum number of processes of a chunk
+        :return: generator of ProcessTable
+        """
+        for start in range(0, size, chunk_size):
+            yield self.generate(min(chunk_size, size - start))
+
+    def write_csv(self, path, size: int, chunk_size: int = 1000000) -> bool:
+        """
+        generate processes and write them to a csv file chunk by chunk, so memory doesn't depend on size
+        :param path: path to save csv file
+        :param size: number of processes
+        :param chunk_size: number of processes that are in memory at once
+        :return: bool
+        """
+        with open(path, 'w', newline='') as file:
+            header = True
+            for processes in self.chunks(size, chunk_size):
+                pd.DataFrame({
+                    'pid': processes.pid,
+                    'arrival_time': processes.arrival_time,
+                    'priority': processes.priority,
+                    'burst_time': processes.burst_time,
+                }).to_csv(file, header=header, index=False)
+                header = False
+            if header:
+                # an empty workload still has columns
+                file.write('pid,arrival_time,priority,burst_time\n')
+        return True
+
+    def write_npy(self, path, size: int, chunk_size: int = 1000000) -> bool:
+        """
+        generate processes and write them to a .npy folder chunk by chunk. files are filled through memory maps, so
+        memory doesn't depend on size
+        :param path: path of the folder
+        :param size: number of processes
+        :param chunk_size: number of processes that are in memory at once
+        :return: bool
+        """
+        # types are known before generating, so columns are never converted
+        time_type = np.int64 if self.integer_times else np.float64
+        columns = storage.open_columns(path, {
+            'pid': np.int64,
+            'arrival_time': time_type,
+            'priority': np.int64,
+            'burst_time': time_type,
+        }, size)
+        start = 0
+        for processes in self.chunks(size, chunk_size):
+            end = start + len(processes)
+            for name, column in columns.items():
+                column[start:end] = getattr(processes, name)
+            start = end
+        for column in columns.values():
+            column.flush()
+        return True
+
+    def write(self, path, size: int, chunk_size: int = 1000000) -> bool:
+        """
+        generate processes and write them to a file. format of the file is found by its suffix (see storage module).
+        csv and .npy files are written chunk by chunk, parquet and arrow files are generated in memory at once
+        :param path: path of the file
+        :param size: number of processes
+        :param chunk_size: number of processes that are in memory at once
+        :return: bool
+        """
+        file_format = storage.get_format(path)
+        if file_format == 'csv':
+            return self.write_csv(path, size, chunk_size)
+        if file_format == 'npy':
+            return self.write_npy(path, size, chunk_size)
+        processes = self.generate(size)
+        return storage.write_columns(path, {
+            'pid': processes.pid,
+            'arrival_time': processes.arrival_time,
+            'priority': processes.priority,
+            'burst_time': processes.burst_time,
+        })